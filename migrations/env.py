@@ -13,6 +13,11 @@ import src.users.models
 import src.admin.models
 import src.matches.models
 import src.tournaments.models
+import src.uploads.models
+import src.outbox.models
+import src.brackets.models
+import src.standings.models
+import src.ratings.models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
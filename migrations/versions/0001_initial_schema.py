@@ -0,0 +1,127 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('User',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=48), nullable=False),
+    sa.Column('avatar_url', sa.String(length=256), nullable=True),
+    sa.Column('first_name', sa.String(length=48), nullable=True),
+    sa.Column('last_name', sa.String(length=48), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('password', sa.LargeBinary(length=60), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('Admin',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['User.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('Team',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=48), nullable=False),
+    sa.Column('avatar_url', sa.String(length=256), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('TeamMember',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['User.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('team_id', 'member_id')
+    )
+    op.create_table('TeamJoinRequest',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['user_id'], ['User.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('team_id', 'user_id')
+    )
+    op.create_table('Match',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('team_winner_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['team_winner_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('MatchMember',
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['match_id'], ['Match.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('match_id', 'team_id')
+    )
+    op.create_table('MatchStack',
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['match_id', 'team_id'], ['MatchMember.match_id', 'MatchMember.team_id'], ),
+    sa.ForeignKeyConstraint(['match_id'], ['Match.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['team_id', 'member_id'], ['TeamMember.team_id', 'TeamMember.member_id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('match_id', 'team_id', 'member_id')
+    )
+    op.create_table('Game',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('short_name', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name'),
+    sa.UniqueConstraint('short_name')
+    )
+    op.create_table('Tournament',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('description', sa.String(length=512), nullable=True),
+    sa.Column('poster_url', sa.String(length=256), nullable=True),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['Game.id'], ondelete='restrict'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('TournamentMember',
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['Tournament.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('tournament_id', 'team_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('TournamentMember')
+    op.drop_table('Tournament')
+    op.drop_table('Game')
+    op.drop_table('MatchStack')
+    op.drop_table('MatchMember')
+    op.drop_table('Match')
+    op.drop_table('TeamJoinRequest')
+    op.drop_table('TeamMember')
+    op.drop_table('Team')
+    op.drop_table('Admin')
+    op.drop_table('User')
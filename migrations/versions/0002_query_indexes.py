@@ -0,0 +1,68 @@
+"""Indexes for router query patterns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.create_index('ix_User_name_lower', 'User', [sa.text('lower(name)')], unique=False)
+    op.create_index('ix_User_name_trgm', 'User', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_User_created_at_id', 'User', ['created_at', 'id'], unique=False)
+
+    op.create_index('ix_Team_name_lower', 'Team', [sa.text('lower(name)')], unique=False)
+    op.create_index('ix_Team_name_trgm', 'Team', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+    op.create_index('ix_TeamMember_member_id', 'TeamMember', ['member_id'], unique=False)
+    op.create_index('ix_TeamJoinRequest_user_id_type', 'TeamJoinRequest', ['user_id', 'type'], unique=False)
+
+    op.create_index('ix_Match_status', 'Match', ['status'], unique=False)
+    op.create_index('ix_Match_created_at_id', 'Match', ['created_at', 'id'], unique=False)
+    op.create_index('ix_MatchMember_team_id', 'MatchMember', ['team_id'], unique=False)
+
+    op.create_index('ix_Game_name_lower', 'Game', [sa.text('lower(name)')], unique=False)
+    op.create_index('ix_Game_short_name_lower', 'Game', [sa.text('lower(short_name)')], unique=False)
+
+    op.create_index('ix_Tournament_game_id', 'Tournament', ['game_id'], unique=False)
+    op.create_index('ix_Tournament_status', 'Tournament', ['status'], unique=False)
+    op.create_index('ix_TournamentMember_team_id', 'TournamentMember', ['team_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_TournamentMember_team_id', table_name='TournamentMember')
+    op.drop_index('ix_Tournament_status', table_name='Tournament')
+    op.drop_index('ix_Tournament_game_id', table_name='Tournament')
+
+    op.drop_index('ix_Game_short_name_lower', table_name='Game')
+    op.drop_index('ix_Game_name_lower', table_name='Game')
+
+    op.drop_index('ix_MatchMember_team_id', table_name='MatchMember')
+    op.drop_index('ix_Match_created_at_id', table_name='Match')
+    op.drop_index('ix_Match_status', table_name='Match')
+
+    op.drop_index('ix_TeamJoinRequest_user_id_type', table_name='TeamJoinRequest')
+    op.drop_index('ix_TeamMember_member_id', table_name='TeamMember')
+
+    op.drop_index('ix_Team_name_trgm', table_name='Team')
+    op.drop_index('ix_Team_name_lower', table_name='Team')
+
+    op.drop_index('ix_User_created_at_id', table_name='User')
+    op.drop_index('ix_User_name_trgm', table_name='User')
+    op.drop_index('ix_User_name_lower', table_name='User')
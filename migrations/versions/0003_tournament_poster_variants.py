@@ -0,0 +1,26 @@
+"""Tournament poster variants
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('Tournament', sa.Column('poster_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('Tournament', 'poster_variants')
@@ -0,0 +1,34 @@
+"""Content-addressed stored objects
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('StoredObject',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('object_name', sa.String(length=256), nullable=False),
+    sa.Column('content_type', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('variants', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('StoredObject')
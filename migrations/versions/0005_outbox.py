@@ -0,0 +1,41 @@
+"""Outbox and tournament poster status
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('Outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=512), nullable=True),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_Outbox_status_available_at', 'Outbox', ['status', 'available_at'], unique=False)
+    # Existing posters were uploaded synchronously, so they are already in place
+    op.add_column('Tournament', sa.Column('poster_status', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('Tournament', 'poster_status')
+    op.drop_index('ix_Outbox_status_available_at', table_name='Outbox')
+    op.drop_table('Outbox')
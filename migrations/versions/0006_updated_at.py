@@ -0,0 +1,30 @@
+"""Track updated_at on teams, tournaments and matches
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 17:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('Team', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('Tournament', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('Match', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('Match', 'updated_at')
+    op.drop_column('Tournament', 'updated_at')
+    op.drop_column('Team', 'updated_at')
@@ -0,0 +1,62 @@
+"""Bracket structure
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('Bracket',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('format', sa.Integer(), nullable=False),
+    sa.Column('rounds', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['tournament_id'], ['Tournament.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tournament_id')
+    )
+    op.create_table('BracketMatch',
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('bracket_id', sa.Integer(), nullable=False),
+    sa.Column('side', sa.Integer(), nullable=False),
+    sa.Column('round', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('first_team_id', sa.Integer(), nullable=True),
+    sa.Column('second_team_id', sa.Integer(), nullable=True),
+    sa.Column('next_match_id', sa.Integer(), nullable=True),
+    sa.Column('next_slot', sa.Integer(), nullable=True),
+    sa.Column('loser_match_id', sa.Integer(), nullable=True),
+    sa.Column('loser_slot', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['bracket_id'], ['Bracket.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['first_team_id'], ['Team.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['loser_match_id'], ['Match.id'], ondelete='set null'),
+    sa.ForeignKeyConstraint(['match_id'], ['Match.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['next_match_id'], ['Match.id'], ondelete='set null'),
+    sa.ForeignKeyConstraint(['second_team_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('match_id')
+    )
+    op.create_index('ix_BracketMatch_bracket_id_round', 'BracketMatch', ['bracket_id', 'round'], unique=False)
+    op.create_index('ix_BracketMatch_next_match_id', 'BracketMatch', ['next_match_id'], unique=False)
+    op.create_index('ix_BracketMatch_loser_match_id', 'BracketMatch', ['loser_match_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_BracketMatch_loser_match_id', table_name='BracketMatch')
+    op.drop_index('ix_BracketMatch_next_match_id', table_name='BracketMatch')
+    op.drop_index('ix_BracketMatch_bracket_id_round', table_name='BracketMatch')
+    op.drop_table('BracketMatch')
+    op.drop_table('Bracket')
@@ -0,0 +1,38 @@
+"""Tournament standings
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('Standing',
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('played', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('byes', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('buchholz', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['Tournament.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('tournament_id', 'team_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('Standing')
@@ -0,0 +1,38 @@
+"""Team ratings
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('Rating',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('matches', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['Game.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['team_id'], ['Team.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('game_id', 'team_id')
+    )
+    op.create_index('ix_Rating_game_id_rating_team_id', 'Rating', ['game_id', 'rating', 'team_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_Rating_game_id_rating_team_id', table_name='Rating')
+    op.drop_table('Rating')
@@ -0,0 +1,28 @@
+"""Tournament member seeds
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 22:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('TournamentMember', sa.Column('seed', sa.Integer(), nullable=True))
+    op.add_column('TournamentMember', sa.Column('seed_locked', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('TournamentMember', 'seed_locked')
+    op.drop_column('TournamentMember', 'seed')
@@ -0,0 +1,125 @@
+import asyncio
+from http.cookies import SimpleCookie
+from os import environ
+from statistics import median
+from time import perf_counter
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, delete, select, literal, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import engine, read_engine
+from src.auth import auth_manager
+from src.main import app
+from src.response_cache import response_cache
+from src.users.models import UserORM
+from src.teams.models import TeamORM, TeamMemberORM
+from src.teams.enums import ETeamMemberRole
+
+
+# Needs the DB_* variables of a migrated scratch database; every row it creates is deleted at the end
+MEMBERSHIPS = [int(size) for size in environ.get("BENCHMARK_MEMBERSHIPS", "10000,100000,1000000").split(",")]
+OUTSIDE_USERS = int(environ.get("BENCHMARK_OUTSIDE_USERS", 1000))
+CALLER_TEAMS = int(environ.get("BENCHMARK_CALLER_TEAMS", 5))
+TEAM_SIZE = int(environ.get("BENCHMARK_TEAM_SIZE", 5))
+REPEATS = int(environ.get("BENCHMARK_REPEATS", 20))
+
+
+async def create_users(session: AsyncSession, prefix: str, count: int) -> list[int]:
+    return (await session.scalars(
+        insert(UserORM).returning(UserORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}", "password": b"-"} for index in range(count)]
+    )).all()
+
+
+async def create_teams(session: AsyncSession, prefix: str, start: int, stop: int) -> list[int]:
+    return (await session.scalars(
+        insert(TeamORM).returning(TeamORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}"} for index in range(start, stop)]
+    )).all()
+
+
+async def add_members(session: AsyncSession, team_ids: list[int], users_prefix: str):
+    await session.execute(
+        insert(
+            TeamMemberORM
+        ).from_select(
+            ["team_id", "member_id", "role"],
+            select(
+                TeamORM.id, UserORM.id, literal(ETeamMemberRole.MEMBER)
+            ).join(
+                UserORM, true()
+            ).where(
+                TeamORM.id.in_(team_ids),
+                UserORM.name.startswith(users_prefix)
+            )
+        )
+    )
+
+
+async def main():
+    prefix = f"bench{uuid4().hex[:8]}_"
+    fetched = []
+
+    def record(_connection, cursor, *_):
+        fetched.append(max(cursor.rowcount, 0))
+
+    for sync_engine in {engine.sync_engine, read_engine.sync_engine}:
+        event.listen(sync_engine, "after_cursor_execute", record)
+
+    # The handler is measured, not the response cache in front of it
+    response_cache.backend = None
+
+    try:
+        async with AsyncSession(engine) as session:
+            # The caller shares TEAM_SIZE-member teams with a few users; everyone else is an outside member
+            caller_id, *_ = await create_users(session, prefix + "caller", TEAM_SIZE)
+            await add_members(session, await create_teams(session, prefix + "own", 0, CALLER_TEAMS), prefix + "caller")
+            await create_users(session, prefix + "outside", OUTSIDE_USERS)
+            await session.commit()
+
+            cookie = SimpleCookie((await auth_manager.login(caller_id)).headers["set-cookie"])
+            outside_teams = 0
+
+            print(f"/me/teams for a caller in {CALLER_TEAMS} teams of {TEAM_SIZE}, {REPEATS} requests per size")
+            print(f"{'outside rows':>12} {'rows fetched':>12} {'p50 ms':>8} {'max ms':>8}")
+
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+                client.cookies = {name: morsel.value for name, morsel in cookie.items()}
+
+                for memberships in MEMBERSHIPS:
+                    target_teams = memberships // OUTSIDE_USERS
+
+                    if target_teams > outside_teams:
+                        team_ids = await create_teams(session, prefix + "outside", outside_teams, target_teams)
+                        await add_members(session, team_ids, prefix + "outside")
+                        await session.commit()
+                        outside_teams = target_teams
+
+                    latencies = []
+
+                    for _ in range(REPEATS):
+                        fetched.clear()
+                        started_at = perf_counter()
+                        (await client.get("/me/teams")).raise_for_status()
+                        latencies.append(perf_counter() - started_at)
+
+                    print(
+                        f"{outside_teams * OUTSIDE_USERS:>12} {sum(fetched):>12} "
+                        f"{median(latencies) * 1000:>8.2f} {max(latencies) * 1000:>8.2f}"
+                    )
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(TeamORM).where(TeamORM.name.startswith(prefix)))
+            await session.execute(delete(UserORM).where(UserORM.name.startswith(prefix)))
+            await session.commit()
+
+        await engine.dispose()
+
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+import asyncio
+from os import environ
+from statistics import median
+from time import perf_counter
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import engine, read_engine
+from src.main import app
+from src.response_cache import response_cache
+from src.users.models import UserORM
+from src.teams.models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+from src.teams.enums import ETeamJoinRequestType
+from src.tournaments.models import GameORM, TournamentORM, TournamentMemberORM
+
+
+# Needs the DB_* variables of a migrated scratch database; every row it creates is deleted at the end
+TOURNAMENTS = [int(size) for size in environ.get("BENCHMARK_TOURNAMENTS", "10,100,1000").split(",")]
+TEAMS = int(environ.get("BENCHMARK_TEAMS", 8))
+MEMBERS = int(environ.get("BENCHMARK_MEMBERS", 5))
+REQUESTS = int(environ.get("BENCHMARK_REQUESTS", 5))
+PAGE_SIZE = int(environ.get("BENCHMARK_PAGE_SIZE", 100))
+REPEATS = int(environ.get("BENCHMARK_REPEATS", 20))
+
+
+async def add_tournaments(session: AsyncSession, prefix: str, game_id: int, user_ids: list[int], start: int,
+                          stop: int) -> list[int]:
+    # Every team has the same MEMBERS members and REQUESTS join requests, so a page's graph is easy to size
+    tournament_ids = (await session.scalars(
+        insert(TournamentORM).returning(TournamentORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}", "game_id": game_id} for index in range(start, stop)]
+    )).all()
+
+    team_ids = (await session.scalars(
+        insert(TeamORM).returning(TeamORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}_{team}"} for index in range(start, stop) for team in range(TEAMS)]
+    )).all()
+
+    await session.execute(insert(TournamentMemberORM), [
+        {"tournament_id": tournament_ids[index // TEAMS], "team_id": team_id}
+        for index, team_id in enumerate(team_ids)
+    ])
+    await session.execute(insert(TeamMemberORM), [
+        {"team_id": team_id, "member_id": user_id} for team_id in team_ids for user_id in user_ids[:MEMBERS]
+    ])
+    await session.execute(insert(TeamJoinRequestORM), [
+        {"team_id": team_id, "user_id": user_id, "type": ETeamJoinRequestType.REQUEST}
+        for team_id in team_ids for user_id in user_ids[MEMBERS:]
+    ])
+    await session.commit()
+
+    return tournament_ids
+
+
+async def main():
+    prefix = f"bench{uuid4().hex[:8]}_"
+    fetched = []
+
+    def record(_connection, cursor, *_):
+        fetched.append(max(cursor.rowcount, 0))
+
+    for sync_engine in {engine.sync_engine, read_engine.sync_engine}:
+        event.listen(sync_engine, "after_cursor_execute", record)
+
+    # The loaders are measured, not the response cache in front of them
+    response_cache.backend = None
+
+    async def timed(client: AsyncClient, url: str, params: dict) -> tuple[dict, float, int]:
+        fetched.clear()
+        started_at = perf_counter()
+        response = await client.get(url, params=params)
+        elapsed = perf_counter() - started_at
+
+        response.raise_for_status()
+
+        return response.json(), elapsed, sum(fetched)
+
+    try:
+        async with AsyncSession(engine) as session:
+            user_ids = (await session.scalars(
+                insert(UserORM).returning(UserORM.id, sort_by_parameter_order=True),
+                [{"name": f"{prefix}{index}", "password": b"-"} for index in range(MEMBERS + REQUESTS)]
+            )).all()
+
+            game_id = (await session.execute(
+                insert(GameORM).values(name=prefix, short_name=prefix).returning(GameORM.id)
+            )).scalar_one()
+
+            await session.commit()
+
+            tournament_ids = []
+
+            print(
+                f"Tournaments of {TEAMS} teams with {MEMBERS} members and {REQUESTS} join requests each, "
+                f"pages of {PAGE_SIZE}"
+            )
+            print(
+                f"{'tournaments':>11} {'list rows':>10} {'list ms':>9} {'rows/page':>10} {'page p50 ms':>12} "
+                f"{'one rows':>9} {'one p50 ms':>11}"
+            )
+
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+                for size in TOURNAMENTS:
+                    if size > len(tournament_ids):
+                        tournament_ids += await add_tournaments(
+                            session, prefix, game_id, user_ids, len(tournament_ids), size
+                        )
+
+                    # Every page of the game's tournaments, following the cursor
+                    params = {"game_id": game_id, "limit": PAGE_SIZE}
+                    pages = []
+
+                    while True:
+                        page, elapsed, rows = await timed(client, "/tournaments/", params)
+                        pages.append((elapsed, rows))
+
+                        if page["next_cursor"] is None:
+                            break
+
+                        params["cursor"] = page["next_cursor"]
+
+                    one = [await timed(client, "/tournament/", {"id": tournament_ids[0]}) for _ in range(REPEATS)]
+
+                    print(
+                        f"{size:>11} {sum(rows for _, rows in pages):>10} "
+                        f"{sum(elapsed for elapsed, _ in pages) * 1000:>9.1f} "
+                        f"{max(rows for _, rows in pages):>10} {median(elapsed for elapsed, _ in pages) * 1000:>12.2f} "
+                        f"{one[0][2]:>9} {median(elapsed for _, elapsed, _ in one) * 1000:>11.2f}"
+                    )
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(TournamentORM).where(TournamentORM.name.startswith(prefix)))
+            await session.execute(delete(GameORM).where(GameORM.name == prefix))
+            await session.execute(delete(TeamORM).where(TeamORM.name.startswith(prefix)))
+            await session.execute(delete(UserORM).where(UserORM.name.startswith(prefix)))
+            await session.commit()
+
+        await engine.dispose()
+
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+import asyncio
+from os import environ
+from statistics import mean, quantiles
+from time import perf_counter
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+
+from src.s3client import S3Client
+
+
+# Point these at a local S3 stand-in, e.g. `moto_server -p 5000` or MinIO on its default port
+ENDPOINT_URL = environ.get("S3_BENCHMARK_ENDPOINT_URL", "http://127.0.0.1:9000")
+ACCESS_KEY = environ.get("S3_BENCHMARK_ACCESS_KEY", "minioadmin")
+SECRET_KEY = environ.get("S3_BENCHMARK_SECRET_KEY", "minioadmin")
+BUCKET_NAME = environ.get("S3_BENCHMARK_BUCKET", "benchmark")
+UPLOADS = int(environ.get("S3_BENCHMARK_UPLOADS", 200))
+OBJECT_SIZE = int(environ.get("S3_BENCHMARK_OBJECT_SIZE", 64 * 1024))
+CONCURRENCY = int(environ.get("S3_BENCHMARK_CONCURRENCY", 1))
+
+
+def make_client() -> S3Client:
+    return S3Client(
+        access_key=ACCESS_KEY,
+        secret_key=SECRET_KEY,
+        endpoint_url=ENDPOINT_URL,
+        file_url_template=ENDPOINT_URL + "/{bucket_name}",
+        bucket_name=BUCKET_NAME
+    )
+
+
+async def create_bucket(s3_client: S3Client):
+    async with s3_client.get_client() as client:
+        try:
+            await client.create_bucket(Bucket=BUCKET_NAME)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                raise
+
+
+async def run(s3_client: S3Client, prefix: str) -> list[float]:
+    body = b"\0" * OBJECT_SIZE
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def upload(index: int):
+        async with semaphore:
+            started_at = perf_counter()
+            await s3_client.upload_file(body, f"{prefix}/{index}", "application/octet-stream")
+            latencies.append(perf_counter() - started_at)
+
+    await asyncio.gather(*(upload(index) for index in range(UPLOADS)))
+
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float):
+    percentiles = quantiles(latencies, n=100)
+
+    print(
+        f"{name:<10} mean {mean(latencies) * 1000:7.2f} ms  p50 {percentiles[49] * 1000:7.2f} ms  "
+        f"p95 {percentiles[94] * 1000:7.2f} ms  {len(latencies) / elapsed:8.1f} uploads/s"
+    )
+
+
+async def main():
+    prefix = f"benchmark-{uuid4().hex[:8]}"
+    print(f"{UPLOADS} uploads of {OBJECT_SIZE} bytes to {ENDPOINT_URL}, concurrency {CONCURRENCY}")
+
+    # Without start() every upload opens and closes its own client, as before the pooled client
+    per_call = make_client()
+    await create_bucket(per_call)
+
+    started_at = perf_counter()
+    report("per-call", await run(per_call, prefix + "/per-call"), perf_counter() - started_at)
+
+    pooled = make_client()
+    await pooled.start()
+
+    try:
+        started_at = perf_counter()
+        report("pooled", await run(pooled, prefix + "/pooled"), perf_counter() - started_at)
+    finally:
+        await pooled.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
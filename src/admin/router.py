@@ -1,11 +1,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth import auth_manager
-from src.auth.core.password import Password
+from src.auth import auth_manager, password_service
 from src.auth.schemas import SUserLogin
 from src.database import get_async_session
 from src.users.models import UserORM
@@ -29,7 +28,7 @@ async def login(session: Annotated[AsyncSession, Depends(get_async_session)],
         select(
             UserORM
         ).where(
-            UserORM.name.ilike(data.name)
+            func.lower(UserORM.name) == data.name.lower()
         )
     )).scalar_one_or_none()
 
@@ -47,7 +46,7 @@ async def login(session: Annotated[AsyncSession, Depends(get_async_session)],
     if admin is None:
         raise unauthorized_exc
 
-    if not Password.validate(data.password, user.password):
+    if not await password_service.validate(data.password, user.password):
         raise unauthorized_exc
 
     return await auth_manager.login(user.id, is_admin=True)
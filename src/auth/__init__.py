@@ -1,14 +1,31 @@
-from src.config import JWT_SECRET
+from src.cache import TTLCache
+from src.config import (JWT_SECRET, JWT_CACHE_SIZE, JWT_CACHE_TTL, JWT_NEGATIVE_CACHE_TTL, PASSWORD_HASH_WORKERS,
+                        PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_USE_PROCESSES, USER_CACHE_SIZE, USER_CACHE_TTL)
 
 from .core.auth_manager import AuthManager
 from .core.auth_backend import AuthBackend
 from .core.transport import CookieTransport
 from .core.strategy import JWTStrategy
+from .core.password import PasswordService
+from .core.principal import Principal
+from .core.user_cache import UserCache
 
 
+user_cache = UserCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+user_cache.install_invalidation_hooks()
+
+jwt_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL) if JWT_CACHE_SIZE > 0 else None
+
 auth_manager = AuthManager(
     AuthBackend(
         CookieTransport(cookie_max_age=360000000),
-        JWTStrategy(JWT_SECRET)
-    )
+        JWTStrategy(JWT_SECRET, cache=jwt_cache, negative_ttl=JWT_NEGATIVE_CACHE_TTL)
+    ),
+    user_cache=user_cache
+)
+
+password_service = PasswordService(
+    workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+    use_processes=PASSWORD_HASH_USE_PROCESSES
 )
@@ -2,19 +2,25 @@ from fastapi import Response
 
 from .auth_backend import AuthBackend
 from .auth_scheme import AuthScheme, AuthSchemeAdmin
+from .user_cache import UserCache
 
 
 class AuthManager:
-    def __init__(self, backend: AuthBackend):
+    def __init__(self, backend: AuthBackend, user_cache: UserCache | None = None):
         self.backend = backend
+        self.user_cache = user_cache
 
-        self.auth_scheme = AuthScheme(self.backend)
-        self.auth_scheme_admin = AuthSchemeAdmin(self.backend)
+        self.auth_scheme = AuthScheme(self.backend, self.user_cache)
+        self.auth_scheme_admin = AuthSchemeAdmin(self.backend, self.user_cache)
 
         self.current_user = self.auth_scheme
         self.current_user_or_none = self.auth_scheme.current_user_or_none
 
+        self.current_principal = self.auth_scheme.principal
+        self.current_principal_or_none = self.auth_scheme.principal_or_none
+
         self.current_administrator = self.auth_scheme_admin
+        self.current_administrator_principal = self.auth_scheme_admin.principal
 
     async def login(self, id: int, is_admin: bool = False) -> Response:
         return await self.backend.login(id, is_admin)
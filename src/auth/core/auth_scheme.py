@@ -4,95 +4,87 @@ from fastapi import Depends, Request, HTTPException, status
 from fastapi.security.oauth2 import OAuth2Model
 from fastapi.security.base import SecurityBase
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
 from src.users.models import UserORM
 
 from .auth_backend import AuthBackend
+from .principal import Principal
+from .user_cache import UserCache
 
 
 class AuthScheme(SecurityBase):
-    def __init__(self, backend: AuthBackend):
+    def __init__(self, backend: AuthBackend, user_cache: UserCache | None = None):
 
         super().__init__()
 
         self.backend = backend
+        self.user_cache = user_cache
         self.get_async_session = get_async_session
 
         self.model = OAuth2Model(flows={})  # type: ignore
         self.scheme_name = self.__class__.__name__
 
-    async def __call__(self, request: Request, session: Annotated[AsyncSession, Depends(get_async_session)]) -> UserORM:
-        unauthorized_exc = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-        )
-
+    def get_token_data(self, request: Request) -> dict | None:
         token = self.backend.transport.get_token(request)
 
         if token is None:
-            raise unauthorized_exc
+            return None
 
         user_data = self.backend.strategy.decode(token)
 
-        if user_data is None:
-            raise unauthorized_exc
-
-        query = select(UserORM).where(UserORM.id == user_data.get("id")).limit(1)
-        result = (await session.execute(query)).scalar_one_or_none()
+        if user_data is None or user_data.get("id") is None:
+            return None
 
-        if result is None:
-            raise unauthorized_exc
+        return user_data
 
-        return result
+    def authorize(self, user_data: dict):
+        ...
 
-    async def current_user_or_none(self, session: Annotated[AsyncSession, Depends(get_async_session)],
-                                   request: Request) -> UserORM | None:
-        token = self.backend.transport.get_token(request)
+    async def __call__(self, request: Request, session: Annotated[AsyncSession, Depends(get_async_session)]) -> UserORM:
+        principal = await self.principal(request, session)
 
-        if token is None:
-            return None
+        return await principal.get_user()
 
-        user_data = self.backend.strategy.decode(token)
+    async def principal(self, request: Request,
+                        session: Annotated[AsyncSession, Depends(get_async_session)]) -> Principal:
+        user_data = self.get_token_data(request)
 
         if user_data is None:
-            return None
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
 
-        query = select(UserORM).where(UserORM.id == user_data.get("id")).limit(1)
-        result = (await session.execute(query)).scalar_one_or_none()
+        self.authorize(user_data)
 
-        return result
+        return Principal.from_token_data(user_data, session, self.user_cache)
 
+    async def principal_or_none(self, session: Annotated[AsyncSession, Depends(get_async_session)],
+                                request: Request) -> Principal | None:
+        user_data = self.get_token_data(request)
 
-class AuthSchemeAdmin(AuthScheme):
-    def __init__(self, backend: AuthBackend):
-        super().__init__(backend)
+        if user_data is None:
+            return None
 
-    async def __call__(self, request: Request, session: Annotated[AsyncSession, Depends(get_async_session)]) -> UserORM:
-        unauthorized_exc = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-        )
+        return Principal.from_token_data(user_data, session, self.user_cache)
 
-        token = self.backend.transport.get_token(request)
+    async def current_user_or_none(self, session: Annotated[AsyncSession, Depends(get_async_session)],
+                                   request: Request) -> UserORM | None:
+        principal = await self.principal_or_none(session, request)
 
-        if token is None:
-            raise unauthorized_exc
+        if principal is None:
+            return None
 
-        user_data = self.backend.strategy.decode(token)
+        return await principal.get_user_or_none()
 
-        if user_data is None:
-            raise unauthorized_exc
 
+class AuthSchemeAdmin(AuthScheme):
+    def __init__(self, backend: AuthBackend, user_cache: UserCache | None = None):
+        super().__init__(backend, user_cache)
+
+    def authorize(self, user_data: dict):
         if user_data.get("adm") is None or not user_data.get("adm"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN
             )
-
-        query = select(UserORM).where(UserORM.id == user_data.get("id")).limit(1)
-        result = (await session.execute(query)).scalar_one_or_none()
-
-        if result is None:
-            raise unauthorized_exc
-
-        return result
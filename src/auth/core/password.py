@@ -1,4 +1,10 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+
 import bcrypt
+from fastapi import HTTPException, status
 
 
 class Password:
@@ -12,3 +18,84 @@ class Password:
     @staticmethod
     def validate(password: str, hashed_password: bytes) -> bool:
         return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
+
+
+@dataclass
+class PasswordMetrics:
+    calls: int = 0
+    rejected: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def observe(self, elapsed: float):
+        self.calls += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time
+        }
+
+
+class PasswordService:
+    def __init__(self, workers: int = 4, max_pending: int = 64, use_processes: bool = False):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+
+        self.pending = 0
+        self.metrics = {"hash": PasswordMetrics(), "validate": PasswordMetrics()}
+
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.workers)
+
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, operation: str, func, *args):
+        metrics = self.metrics[operation]
+
+        if self.pending >= self.max_pending:
+            metrics.rejected += 1
+
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The server is busy, try again later",
+                headers={"Retry-After": "1"}
+            )
+
+        self.pending += 1
+        started_at = perf_counter()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            metrics.observe(perf_counter() - started_at)
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run("hash", Password.hash, password)
+
+    async def validate(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run("validate", Password.validate, password, hashed_password)
+
+    def get_metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            **{operation: metrics.as_dict() for operation, metrics in self.metrics.items()}
+        }
@@ -0,0 +1,48 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.users.models import UserORM
+
+from .user_cache import UserCache
+
+
+class Principal:
+    def __init__(self, id: int, is_admin: bool, session: AsyncSession, user_cache: UserCache | None = None):
+        self.id = id
+        self.is_admin = is_admin
+
+        self._session = session
+        self._user_cache = user_cache
+        self._user: UserORM | None = None
+
+    @classmethod
+    def from_token_data(cls, user_data: dict, session: AsyncSession,
+                        user_cache: UserCache | None = None) -> "Principal":
+        return cls(user_data["id"], bool(user_data.get("adm")), session, user_cache)
+
+    async def get_user_or_none(self) -> UserORM | None:
+        if self._user is not None:
+            return self._user
+
+        if self._user_cache is not None:
+            self._user = self._user_cache.get(self.id)
+
+        if self._user is None:
+            query = select(UserORM).where(UserORM.id == self.id).limit(1)
+            self._user = (await self._session.execute(query)).scalar_one_or_none()
+
+            if self._user is not None and self._user_cache is not None:
+                self._user_cache.set(self._user)
+
+        return self._user
+
+    async def get_user(self) -> UserORM:
+        user = await self.get_user_or_none()
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED
+            )
+
+        return user
@@ -1,12 +1,28 @@
+from hashlib import sha256
+from time import time
+
 import jwt
 
+from src.cache import TTLCache
+
 from .abc import BaseStrategy
 
 
+_missing = object()
+
+
 class JWTStrategy(BaseStrategy):
-    def __init__(self, secret: str, algorithms: list[str] = None):
+    def __init__(
+            self,
+            secret: str,
+            algorithms: list[str] = None,
+            cache: TTLCache | None = None,
+            negative_ttl: float = 5
+    ):
         self.secret = secret
         self.algorithms = ["HS256"] if algorithms is None else algorithms
+        self.cache = cache
+        self.negative_ttl = negative_ttl
 
     def encode(self, payload: dict) -> str:
         return jwt.encode(
@@ -16,8 +32,30 @@ class JWTStrategy(BaseStrategy):
         )
 
     def decode(self, token: str) -> dict | None:
-        return jwt.decode(
-            jwt=token,
-            key=self.secret,
-            algorithms=self.algorithms
-        )
+        if self.cache is None:
+            return self._decode(token)
+
+        key = sha256(token.encode("utf-8")).digest()
+        payload = self.cache.get(key, _missing)
+
+        if payload is _missing:
+            payload = self._decode(token)
+
+            if payload is None:
+                self.cache.set(key, None, ttl=self.negative_ttl)
+            elif "exp" not in payload:
+                self.cache.set(key, payload)
+            elif (ttl := min(self.cache.ttl, payload["exp"] - time())) > 0:
+                self.cache.set(key, payload, ttl=ttl)
+
+        return None if payload is None else dict(payload)
+
+    def _decode(self, token: str) -> dict | None:
+        try:
+            return jwt.decode(
+                jwt=token,
+                key=self.secret,
+                algorithms=self.algorithms
+            )
+        except jwt.InvalidTokenError:
+            return None
@@ -0,0 +1,54 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, ORMExecuteState
+
+from src.cache import TTLCache
+from src.users.models import UserORM
+from src.admin.schemas import AdminORM
+
+
+class UserCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, user_id: int) -> UserORM | None:
+        values = self.cache.get(user_id)
+
+        if values is None:
+            return None
+
+        # Every request gets its own transient instance, never bound to another request's session
+        return UserORM(**values)
+
+    def set(self, user: UserORM):
+        self.cache.set(user.id, {attr.key: getattr(user, attr.key) for attr in inspect(UserORM).column_attrs})
+
+    def invalidate(self, user_id: int | None = None):
+        if user_id is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(user_id)
+
+    def get_metrics(self) -> dict:
+        return self.cache.get_metrics()
+
+    def install_invalidation_hooks(self):
+        def on_user_change(_mapper, _connection, target: UserORM):
+            self.invalidate(target.id)
+
+        def on_admin_change(_mapper, _connection, target: AdminORM):
+            self.invalidate(target.user_id)
+
+        def on_orm_execute(state: ORMExecuteState):
+            if not (state.is_insert or state.is_update or state.is_delete) or state.bind_mapper is None:
+                return
+
+            if state.bind_mapper.class_ is AdminORM or (state.bind_mapper.class_ is UserORM and not state.is_insert):
+                self.invalidate()
+
+        for identifier in ("after_update", "after_delete"):
+            event.listen(UserORM, identifier, on_user_change)
+
+        for identifier in ("after_insert", "after_update", "after_delete"):
+            event.listen(AdminORM, identifier, on_admin_change)
+
+        event.listen(Session, "do_orm_execute", on_orm_execute)
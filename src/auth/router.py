@@ -1,16 +1,15 @@
 from typing import Annotated
-from random import randint
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
 from src.users.schemas import SUser
 from src.users.models import UserORM
+from src.avatars.identicon import avatar_url
 
-from . import auth_manager
-from .core.password import Password
+from . import auth_manager, password_service, user_cache
 from .schemas import SUserRegister, SUserLogin
 
 
@@ -23,7 +22,7 @@ session_dependency = Annotated[AsyncSession, Depends(get_async_session)]
 
 @router.post("/register", response_model=SUser)
 async def register(data: SUserRegister, session: session_dependency):
-    query = select(UserORM).where(UserORM.name.ilike(data.name))
+    query = select(UserORM).where(func.lower(UserORM.name) == data.name.lower())
 
     if (await session.execute(query)).first() is not None:
         raise HTTPException(
@@ -32,19 +31,22 @@ async def register(data: SUserRegister, session: session_dependency):
         )
 
     user_data = data.dict()
-    user_data["password"] = Password.hash(user_data["password"])
-    user_data["avatar_url"] = f"https://picsum.photos/{randint(64, 512)}/{randint(64, 512)}"
+    user_data["password"] = await password_service.hash(user_data["password"])
 
     stmt = insert(UserORM).values(user_data).returning(UserORM)
-    result = await session.execute(stmt)
+    user = (await session.execute(stmt)).scalar_one()
+    # The avatar is derived from the id, so it can only be set once the row exists
+    user.avatar_url = avatar_url("user", user.id)
     await session.commit()
 
-    return result.scalar_one()
+    user_cache.invalidate(user.id)
+
+    return user
 
 
 @router.post("/login")
 async def login(data: SUserLogin, session: session_dependency):
-    query = select(UserORM).where(UserORM.name.ilike(data.name))
+    query = select(UserORM).where(func.lower(UserORM.name) == data.name.lower())
     user = (await session.execute(query)).scalar_one_or_none()
 
     if user is None:
@@ -53,7 +55,7 @@ async def login(data: SUserLogin, session: session_dependency):
             detail="Wrong login or password"
         )
 
-    if not Password.validate(data.password, user.password):
+    if not await password_service.validate(data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Wrong login or password"
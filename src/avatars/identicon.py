@@ -0,0 +1,89 @@
+import colorsys
+import hashlib
+import os
+from pathlib import Path
+from tempfile import gettempdir, mkstemp
+from typing import Literal
+
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image
+
+from src.config import AVATAR_CACHE_DIR, AVATAR_BASE_URL, AVATAR_SIZE
+
+
+AvatarKind = Literal["team", "user"]
+
+GRID = 5
+BACKGROUND = (240, 240, 240)
+# Bump when the drawing changes, so cached files and client caches are not reused
+VERSION = 1
+
+
+def avatar_url(kind: AvatarKind, id: int) -> str:
+    return f"{AVATAR_BASE_URL}/avatar/{kind}/{id}.png"
+
+
+def render_identicon(seed: str, size: int) -> Image.Image:
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+
+    hue = int.from_bytes(digest[:2], "big") / 0xFFFF
+    lightness = 0.45 + digest[2] / 255 * 0.15
+    saturation = 0.5 + digest[3] / 255 * 0.2
+    color = tuple(round(channel * 255) for channel in colorsys.hls_to_rgb(hue, lightness, saturation))
+
+    image = Image.new("RGB", (GRID, GRID), BACKGROUND)
+    bits = int.from_bytes(digest[4:8], "big")
+
+    # Only the left half and the middle column are random, the right half mirrors them
+    for row in range(GRID):
+        for column in range((GRID + 1) // 2):
+            if bits >> (row * 3 + column) & 1:
+                image.putpixel((column, row), color)
+                image.putpixel((GRID - 1 - column, row), color)
+
+    # One spare cell of the canvas is split into margins on both sides
+    cell = size // (GRID + 1)
+    offset = (size - cell * GRID) // 2
+
+    canvas = Image.new("RGB", (size, size), BACKGROUND)
+    canvas.paste(image.resize((cell * GRID, cell * GRID), Image.Resampling.NEAREST), (offset, offset))
+
+    return canvas
+
+
+class AvatarGenerator:
+    def __init__(self, cache_dir: Path, size: int = 256):
+        self.cache_dir = cache_dir
+        self.size = size
+
+    def etag(self, kind: AvatarKind, id: int) -> str:
+        return f'"{kind}-{id}-{self.size}-v{VERSION}"'
+
+    def _render(self, kind: AvatarKind, id: int, path: Path):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        descriptor, temp_path = mkstemp(suffix=".png", dir=self.cache_dir)
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                render_identicon(f"{kind}:{id}", self.size).save(file, format="PNG", optimize=True)
+
+            # Concurrent renders of the same avatar produce identical bytes, so the last rename wins harmlessly
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    async def get_path(self, kind: AvatarKind, id: int) -> Path:
+        path = self.cache_dir / f"{kind}_{id}_{self.size}_v{VERSION}.png"
+
+        if not path.exists():
+            await run_in_threadpool(self._render, kind, id, path)
+
+        return path
+
+
+avatar_generator = AvatarGenerator(
+    Path(AVATAR_CACHE_DIR) if AVATAR_CACHE_DIR else Path(gettempdir()) / "avatars",
+    size=AVATAR_SIZE
+)
@@ -0,0 +1,47 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Path, Response, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_read_session
+from src.teams.models import TeamORM
+from src.users.models import UserORM
+
+from .identicon import AvatarKind, avatar_generator
+
+
+router = APIRouter(prefix="/avatar", tags=["Avatars"])
+routers = (router, )
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+MODELS = {"team": TeamORM, "user": UserORM}
+# Primary keys are int4, larger ids cannot exist
+MAX_ID = 2 ** 31 - 1
+
+
+@router.get("/{kind}/{id}.png", response_class=FileResponse)
+async def get_avatar(
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        kind: AvatarKind,
+        id: Annotated[int, Path(ge=1, le=MAX_ID)],
+        if_none_match: Annotated[str | None, Header()] = None
+):
+    etag = avatar_generator.etag(kind, id)
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+
+    if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Only existing rows get a file on disk, otherwise any id would render and fill the cache directory
+    model = MODELS[kind]
+
+    if await session.scalar(select(model.id).where(model.id == id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{kind.capitalize()} with ID {id} does not exist"
+        )
+
+    return FileResponse(await avatar_generator.get_path(kind, id), media_type="image/png", headers=headers)
@@ -0,0 +1,140 @@
+from sqlalchemy import insert, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import touch
+from src.matches.models import MatchORM, MatchMemberORM
+from src.matches.enums import EMatchStatus
+from src.tournaments.models import TournamentORM
+from src.tournaments.enums import ETournamentStatus
+from src.standings.updates import record_result
+
+from .models import BracketORM, BracketMatchORM
+from .enums import EBracketFormat
+from .engine import pair_swiss_round
+
+
+async def lock_bracket_match(session: AsyncSession, match_id: int) -> BracketMatchORM | None:
+    bracket_id = await session.scalar(
+        select(
+            BracketMatchORM.bracket_id
+        ).where(
+            BracketMatchORM.match_id == match_id
+        )
+    )
+
+    if bracket_id is None:
+        return None
+
+    # Results within a bracket are serialized on its row, which keeps slot filling and the round completion check
+    # consistent; it is taken before the match row, so concurrent results cannot deadlock
+    await session.execute(
+        select(
+            BracketORM.id
+        ).where(
+            BracketORM.id == bracket_id
+        ).with_for_update()
+    )
+
+    return (await session.execute(
+        select(
+            BracketMatchORM
+        ).where(
+            BracketMatchORM.match_id == match_id
+        )
+    )).scalar_one()
+
+
+async def seat_team(session: AsyncSession, match_id: int, slot: int, team_id: int):
+    first_team_id, second_team_id = (await session.execute(
+        update(
+            BracketMatchORM
+        ).where(
+            BracketMatchORM.match_id == match_id
+        ).values(
+            **{"first_team_id" if slot == 0 else "second_team_id": team_id}
+        ).returning(
+            BracketMatchORM.first_team_id, BracketMatchORM.second_team_id
+        )
+    )).one()
+
+    await session.execute(
+        insert(
+            MatchMemberORM
+        ).values(
+            match_id=match_id,
+            team_id=team_id
+        )
+    )
+
+    if first_team_id is None or second_team_id is None:
+        await touch(session, MatchORM, match_id)
+        return
+
+    await session.execute(
+        update(
+            MatchORM
+        ).where(
+            MatchORM.id == match_id,
+            MatchORM.status == EMatchStatus.waiting
+        ).values(
+            status=EMatchStatus.preparing
+        )
+    )
+
+
+async def advance_bracket(session: AsyncSession, bracket_match: BracketMatchORM, winner_id: int | None) -> list[str]:
+    # Runs after the match itself was closed, in the same transaction; returns the cache tags to invalidate
+    bracket = await session.get(BracketORM, bracket_match.bracket_id)
+    tags = []
+
+    await record_result(session, bracket.tournament_id, bracket_match, winner_id)
+
+    if winner_id is not None:
+        loser_id = next(
+            (
+                team_id for team_id in (bracket_match.first_team_id, bracket_match.second_team_id)
+                if team_id not in (winner_id, None)
+            ),
+            None
+        )
+
+        for match_id, slot, team_id in (
+                (bracket_match.next_match_id, bracket_match.next_slot, winner_id),
+                (bracket_match.loser_match_id, bracket_match.loser_slot, loser_id)
+        ):
+            if match_id is not None and team_id is not None:
+                await seat_team(session, match_id, slot, team_id)
+                tags.append(f"match:{match_id}")
+
+    open_matches = await session.scalar(
+        select(
+            func.count()
+        ).select_from(
+            BracketMatchORM
+        ).join(
+            MatchORM, MatchORM.id == BracketMatchORM.match_id
+        ).where(
+            BracketMatchORM.bracket_id == bracket_match.bracket_id,
+            MatchORM.status.not_in((EMatchStatus.finished, EMatchStatus.cancelled))
+        )
+    )
+
+    if open_matches:
+        return tags
+
+    if bracket.format == EBracketFormat.SWISS and bracket_match.round < bracket.rounds:
+        await pair_swiss_round(session, bracket.id, bracket.tournament_id, bracket_match.round + 1)
+        return [*tags, "matches"]
+
+    await session.execute(
+        update(
+            TournamentORM
+        ).where(
+            TournamentORM.id == bracket.tournament_id,
+            TournamentORM.status == ETournamentStatus.ACTIVE
+        ).values(
+            status=ETournamentStatus.FINISHED
+        )
+    )
+
+    return [*tags, f"tournament:{bracket.tournament_id}", "tournaments"]
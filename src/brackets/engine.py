@@ -0,0 +1,162 @@
+from sqlalchemy import insert, select, update, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.matches.models import MatchORM, MatchMemberORM
+from src.matches.enums import EMatchType, EMatchStatus
+from src.tournaments.models import TournamentMemberORM
+from src.standings.models import StandingORM
+from src.standings.updates import create_standings, record_bye
+
+from .models import BracketORM, BracketMatchORM
+from .enums import EBracketFormat
+from .formats import (PlannedMatch, Key, single_elimination, double_elimination, round_robin, swiss_round,
+                      swiss_rounds)
+
+
+def plan_bracket(format: EBracketFormat, team_ids: list[int]) -> tuple[list[PlannedMatch], int]:
+    if format == EBracketFormat.SINGLE_ELIMINATION:
+        planned = single_elimination(team_ids)
+    elif format == EBracketFormat.DOUBLE_ELIMINATION:
+        planned = double_elimination(team_ids)
+    elif format == EBracketFormat.ROUND_ROBIN:
+        planned = round_robin(team_ids)
+    else:
+        # Later Swiss rounds depend on results and are paired as each round completes
+        planned = swiss_round(1, [(team_id, 0) for team_id in team_ids], set(), set())
+
+    return planned, max(match.round for match in planned)
+
+
+def match_status(match: PlannedMatch) -> EMatchStatus:
+    if match.bye:
+        return EMatchStatus.finished
+
+    return EMatchStatus.preparing if None not in match.teams else EMatchStatus.waiting
+
+
+async def insert_planned_matches(session: AsyncSession, bracket_id: int, tournament_id: int,
+                                 planned: list[PlannedMatch]) -> dict[Key, int]:
+    if not planned:
+        return {}
+
+    match_ids = (await session.scalars(
+        insert(
+            MatchORM
+        ).returning(
+            MatchORM.id, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "type": EMatchType.competitive,
+                "status": match_status(match),
+                # A Swiss bye is recorded as a walkover win
+                "team_winner_id": match.teams[0] if match.bye else None
+            }
+            for match in planned
+        ]
+    )).all()
+
+    ids = {match.key: match_id for match, match_id in zip(planned, match_ids)}
+    bye_ids = [ids[match.key] for match in planned if match.bye]
+
+    if bye_ids:
+        await session.execute(
+            update(
+                MatchORM
+            ).where(
+                MatchORM.id.in_(bye_ids)
+            ).values(
+                finished_at=func.now()
+            )
+        )
+
+    await session.execute(
+        insert(BracketMatchORM),
+        [
+            {
+                "match_id": ids[match.key],
+                "bracket_id": bracket_id,
+                "side": match.side,
+                "round": match.round,
+                "position": match.position,
+                "first_team_id": match.teams[0],
+                "second_team_id": match.teams[1],
+                "next_match_id": ids[match.next[0]] if match.next else None,
+                "next_slot": match.next[1] if match.next else None,
+                "loser_match_id": ids[match.loser[0]] if match.loser else None,
+                "loser_slot": match.loser[1] if match.loser else None
+            }
+            for match in planned
+        ]
+    )
+
+    members = [
+        {"match_id": ids[match.key], "team_id": team_id}
+        for match in planned for team_id in match.teams if team_id is not None
+    ]
+
+    if members:
+        await session.execute(insert(MatchMemberORM), members)
+
+    for match in planned:
+        if match.bye:
+            await record_bye(session, tournament_id, bracket_id, ids[match.key], match.teams[0])
+
+    return ids
+
+
+async def create_bracket(session: AsyncSession, tournament_id: int, format: EBracketFormat,
+                         team_ids: list[int], rounds: int | None = None) -> int:
+    planned, planned_rounds = plan_bracket(format, team_ids)
+
+    if format == EBracketFormat.SWISS:
+        planned_rounds = min(rounds or swiss_rounds(len(team_ids)), len(team_ids) - 1)
+
+    bracket_id = (await session.execute(
+        insert(
+            BracketORM
+        ).values(
+            tournament_id=tournament_id,
+            format=format,
+            rounds=planned_rounds
+        ).returning(
+            BracketORM.id
+        )
+    )).scalar_one()
+
+    await create_standings(session, tournament_id, team_ids)
+    await insert_planned_matches(session, bracket_id, tournament_id, planned)
+
+    return bracket_id
+
+
+async def pair_swiss_round(session: AsyncSession, bracket_id: int, tournament_id: int, round: int):
+    rows = (await session.execute(
+        select(
+            BracketMatchORM.first_team_id, BracketMatchORM.second_team_id
+        ).where(
+            BracketMatchORM.bracket_id == bracket_id
+        )
+    )).all()
+
+    played = {frozenset(row) for row in rows if row.second_team_id is not None}
+    byes = {row.first_team_id for row in rows if row.second_team_id is None}
+
+    # Within a score group teams are ordered by Buchholz, then by seed
+    standings = (await session.execute(
+        select(
+            StandingORM.team_id, StandingORM.points
+        ).join(
+            TournamentMemberORM,
+            and_(
+                TournamentMemberORM.tournament_id == StandingORM.tournament_id,
+                TournamentMemberORM.team_id == StandingORM.team_id
+            )
+        ).where(
+            StandingORM.tournament_id == tournament_id
+        ).order_by(
+            StandingORM.points.desc(), StandingORM.buchholz.desc(), TournamentMemberORM.seed, StandingORM.team_id
+        )
+    )).tuples().all()
+
+    await insert_planned_matches(session, bracket_id, tournament_id, swiss_round(round, standings, played, byes))
@@ -0,0 +1,14 @@
+from enum import IntEnum
+
+
+class EBracketFormat(IntEnum):
+    SINGLE_ELIMINATION = 0
+    DOUBLE_ELIMINATION = 1
+    ROUND_ROBIN = 2
+    SWISS = 3
+
+
+class EBracketSide(IntEnum):
+    UPPER = 0
+    LOWER = 1
+    GRAND_FINAL = 2
@@ -0,0 +1,286 @@
+from dataclasses import dataclass, field
+from functools import cache
+from itertools import groupby
+from typing import Sequence
+
+from .enums import EBracketSide
+
+
+# A slot is fed by a seeded team (None for a bye) or by the winner or loser of another node
+Source = tuple[str, object]
+Key = tuple[EBracketSide, int, int]
+
+
+@dataclass
+class PlannedMatch:
+    side: EBracketSide
+    round: int
+    position: int
+    teams: list[int | None] = field(default_factory=lambda: [None, None])
+    next: tuple[Key, int] | None = None
+    loser: tuple[Key, int] | None = None
+    bye: bool = False
+
+    @property
+    def key(self) -> Key:
+        return self.side, self.round, self.position
+
+
+def seed_order(size: int) -> list[int]:
+    # Standard bracket order, so seeds 1 and 2 can only meet in the final: 0, 7, 3, 4, 1, 6, 2, 5 for 8
+    order = [0]
+
+    while len(order) < size:
+        order = [seed for top in order for seed in (top, len(order) * 2 - 1 - top)]
+
+    return order
+
+
+def elimination_size(count: int) -> int:
+    return 1 << max(1, (count - 1).bit_length())
+
+
+def compile_nodes(nodes: dict[Key, tuple[Source, Source]]) -> list[PlannedMatch]:
+    # Nodes with a single live slot are byes: their occupant is passed straight through to the next node,
+    # so only nodes with both slots live become matches
+    @cache
+    def produces(source: Source) -> bool:
+        kind, value = source
+
+        if kind == "team":
+            return value is not None
+
+        live = [produces(slot_source) for slot_source in nodes[value]]
+
+        return any(live) if kind == "winner" else all(live)
+
+    def is_match(key: Key) -> bool:
+        return all(produces(source) for source in nodes[key])
+
+    def resolve(source: Source) -> Source:
+        kind, value = source
+
+        if kind == "team" or is_match(value):
+            return source
+
+        return resolve(next(slot_source for slot_source in nodes[value] if produces(slot_source)))
+
+    planned = {key: PlannedMatch(*key) for key in nodes if is_match(key)}
+
+    for key, match in planned.items():
+        for slot, source in enumerate(nodes[key]):
+            kind, value = resolve(source)
+
+            if kind == "team":
+                match.teams[slot] = value
+            elif kind == "winner":
+                planned[value].next = (key, slot)
+            else:
+                planned[value].loser = (key, slot)
+
+    return sorted(planned.values(), key=lambda match: match.key)
+
+
+def upper_bracket_nodes(team_ids: Sequence[int]) -> tuple[dict[Key, tuple[Source, Source]], int]:
+    size = elimination_size(len(team_ids))
+    rounds = size.bit_length() - 1
+    seeds = [team_ids[seed] if seed < len(team_ids) else None for seed in seed_order(size)]
+
+    nodes = {
+        (EBracketSide.UPPER, 1, position): (("team", seeds[position * 2]), ("team", seeds[position * 2 + 1]))
+        for position in range(size // 2)
+    }
+
+    for round in range(2, rounds + 1):
+        for position in range(size >> round):
+            nodes[(EBracketSide.UPPER, round, position)] = (
+                ("winner", (EBracketSide.UPPER, round - 1, position * 2)),
+                ("winner", (EBracketSide.UPPER, round - 1, position * 2 + 1))
+            )
+
+    return nodes, rounds
+
+
+def single_elimination(team_ids: Sequence[int]) -> list[PlannedMatch]:
+    nodes, _ = upper_bracket_nodes(team_ids)
+
+    return compile_nodes(nodes)
+
+
+def double_elimination(team_ids: Sequence[int]) -> list[PlannedMatch]:
+    nodes, rounds = upper_bracket_nodes(team_ids)
+    size = elimination_size(len(team_ids))
+
+    def upper(round: int, position: int) -> Key:
+        return EBracketSide.UPPER, round, position
+
+    def lower(round: int, position: int) -> Key:
+        return EBracketSide.LOWER, round, position
+
+    for position in range(size // 4):
+        nodes[lower(1, position)] = (
+            ("loser", upper(1, position * 2)),
+            ("loser", upper(1, position * 2 + 1))
+        )
+
+    for stage in range(1, rounds):
+        count = size >> (stage + 1)
+
+        # Losers dropping from the upper bracket are seated in reverse every other stage to delay rematches
+        for position in range(count):
+            dropped = count - 1 - position if stage % 2 else position
+
+            nodes[lower(stage * 2, position)] = (
+                ("winner", lower(stage * 2 - 1, position)),
+                ("loser", upper(stage + 1, dropped))
+            )
+
+        if stage < rounds - 1:
+            for position in range(count // 2):
+                nodes[lower(stage * 2 + 1, position)] = (
+                    ("winner", lower(stage * 2, position * 2)),
+                    ("winner", lower(stage * 2, position * 2 + 1))
+                )
+
+    lower_champion = ("loser", upper(1, 0)) if rounds == 1 else ("winner", lower((rounds - 1) * 2, 0))
+    nodes[(EBracketSide.GRAND_FINAL, 1, 0)] = (("winner", upper(rounds, 0)), lower_champion)
+
+    return compile_nodes(nodes)
+
+
+def round_robin(team_ids: Sequence[int]) -> list[PlannedMatch]:
+    # Circle method: the first team stays put while the others rotate, a None opponent is a rest round
+    teams = list(team_ids) + ([None] if len(team_ids) % 2 else [])
+    count = len(teams)
+    planned = []
+
+    for round in range(1, count):
+        pairs = [(teams[index], teams[count - 1 - index]) for index in range(count // 2)]
+
+        planned.extend(
+            PlannedMatch(EBracketSide.UPPER, round, position, [first, second])
+            for position, (first, second) in enumerate(
+                pair for pair in pairs if None not in pair
+            )
+        )
+
+        teams = [teams[0], teams[-1], *teams[1:-1]]
+
+    return planned
+
+
+def swiss_rounds(count: int) -> int:
+    return max(1, (count - 1).bit_length())
+
+
+def pair_score_group(group: list[int], played: set[frozenset[int]]) -> tuple[list[tuple[int, int]], list[int]]:
+    # Top half meets bottom half; whoever cannot be paired without a rematch floats down to the next group
+    half = len(group) // 2
+    top, bottom = group[:half], group[half:]
+
+    pairs = []
+    floaters = []
+
+    for team in top:
+        opponent = next((candidate for candidate in bottom if frozenset((team, candidate)) not in played), None)
+
+        if opponent is None:
+            floaters.append(team)
+        else:
+            pairs.append((team, opponent))
+            bottom.remove(opponent)
+
+    return pairs, floaters + bottom
+
+
+def pair_without_rematches(
+        teams: list[int],
+        scores: dict[int, float],
+        played: set[frozenset[int]],
+        budget: int = 100_000
+) -> list[tuple[int, int]] | None:
+    # Depth first: the best unpaired team takes the closest-scored opponent it has not met yet, backtracking on dead
+    # ends; gives up after the budget, since some fields have no rematch-free pairing at all
+    steps = 0
+
+    def search(remaining: list[int]) -> list[tuple[int, int]] | None:
+        nonlocal steps
+
+        if not remaining:
+            return []
+
+        team, rest = remaining[0], remaining[1:]
+
+        for opponent in sorted(rest, key=lambda candidate: abs(scores[candidate] - scores[team])):
+            steps += 1
+
+            if steps > budget:
+                return None
+
+            if frozenset((team, opponent)) in played:
+                continue
+
+            pairs = search([candidate for candidate in rest if candidate != opponent])
+
+            if pairs is not None:
+                return [(team, opponent), *pairs]
+
+        return None
+
+    return search(teams)
+
+
+def swiss_pairings(
+        standings: Sequence[tuple[int, float]],
+        played: set[frozenset[int]],
+        byes: set[int]
+) -> tuple[list[tuple[int, int]], int | None]:
+    # Standings are ordered best first; greedy pairing within score groups is O(n^2) at worst
+    teams = [team for team, _ in standings]
+    scores = dict(standings)
+    bye = None
+
+    if len(teams) % 2:
+        bye = next((team for team in reversed(teams) if team not in byes), teams[-1])
+        teams.remove(bye)
+
+    pairs = []
+    floaters = []
+
+    for _, group in groupby(teams, key=lambda team: scores[team]):
+        group_pairs, floaters = pair_score_group(floaters + list(group), played)
+        pairs.extend(group_pairs)
+
+    while floaters:
+        team = floaters.pop(0)
+        opponent = next(
+            (candidate for candidate in floaters if frozenset((team, candidate)) not in played), floaters[0]
+        )
+
+        floaters.remove(opponent)
+        pairs.append((team, opponent))
+
+    # Floaters left at the bottom may all have met already; re-pair the whole field before accepting a rematch
+    if any(frozenset(pair) in played for pair in pairs):
+        pairs = pair_without_rematches(teams, scores, played) or pairs
+
+    return pairs, bye
+
+
+def swiss_round(
+        round: int,
+        standings: Sequence[tuple[int, float]],
+        played: set[frozenset[int]],
+        byes: set[int]
+) -> list[PlannedMatch]:
+    pairs, bye = swiss_pairings(standings, played, byes)
+
+    planned = [
+        PlannedMatch(EBracketSide.UPPER, round, position, [first, second])
+        for position, (first, second) in enumerate(pairs)
+    ]
+
+    if bye is not None:
+        planned.append(PlannedMatch(EBracketSide.UPPER, round, len(pairs), [bye, None], bye=True))
+
+    return planned
@@ -0,0 +1,13 @@
+from sqlalchemy.orm import selectinload, joinedload
+
+from .models import BracketORM, BracketMatchORM
+
+
+def bracket_loader_options() -> list:
+    return [
+        selectinload(
+            BracketORM.matches
+        ).joinedload(
+            BracketMatchORM.match
+        )
+    ]
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database import Base
+from src.teams.models import TeamORM
+from src.matches.models import MatchORM
+from src.tournaments.models import TournamentORM
+
+from .enums import EBracketFormat, EBracketSide
+
+
+class BracketORM(Base):
+    __tablename__ = "Bracket"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tournament_id: Mapped[int] = mapped_column(
+        ForeignKey(TournamentORM.__tablename__ + ".id", ondelete="cascade"),
+        unique=True
+    )
+    format: Mapped[EBracketFormat] = mapped_column(Integer)
+    rounds: Mapped[int] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    matches: Mapped[list["BracketMatchORM"]] = relationship()
+
+
+class BracketMatchORM(Base):
+    __tablename__ = "BracketMatch"
+
+    match_id: Mapped[int] = mapped_column(
+        ForeignKey(MatchORM.__tablename__ + ".id", ondelete="cascade"),
+        primary_key=True
+    )
+    bracket_id: Mapped[int] = mapped_column(
+        ForeignKey(BracketORM.__tablename__ + ".id", ondelete="cascade")
+    )
+
+    side: Mapped[EBracketSide] = mapped_column(Integer, default=EBracketSide.UPPER)
+    round: Mapped[int] = mapped_column()
+    position: Mapped[int] = mapped_column()
+
+    first_team_id: Mapped[int] = mapped_column(
+        ForeignKey(TeamORM.__tablename__ + ".id", ondelete="cascade"),
+        nullable=True
+    )
+    second_team_id: Mapped[int] = mapped_column(
+        ForeignKey(TeamORM.__tablename__ + ".id", ondelete="cascade"),
+        nullable=True
+    )
+
+    # Where the winner and, in double elimination, the loser are seated next
+    next_match_id: Mapped[int] = mapped_column(
+        ForeignKey(MatchORM.__tablename__ + ".id", ondelete="set null"),
+        nullable=True
+    )
+    next_slot: Mapped[int] = mapped_column(nullable=True)
+    loser_match_id: Mapped[int] = mapped_column(
+        ForeignKey(MatchORM.__tablename__ + ".id", ondelete="set null"),
+        nullable=True
+    )
+    loser_slot: Mapped[int] = mapped_column(nullable=True)
+
+    match: Mapped[MatchORM] = relationship(foreign_keys=[match_id])
+
+
+Index("ix_BracketMatch_bracket_id_round", BracketMatchORM.bracket_id, BracketMatchORM.round)
+Index("ix_BracketMatch_next_match_id", BracketMatchORM.next_match_id)
+Index("ix_BracketMatch_loser_match_id", BracketMatchORM.loser_match_id)
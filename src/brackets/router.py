@@ -0,0 +1,94 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session, get_async_read_session
+from src.auth import auth_manager, Principal
+from src.response_cache import response_cache
+from src.tournaments.models import TournamentORM
+from src.tournaments.enums import ETournamentStatus
+from src.tournaments.seeding import seed_tournament
+
+from .models import BracketORM
+from .loaders import bracket_loader_options
+from .schemas import SBracket, SBracketAdd
+from .engine import create_bracket
+
+
+router = APIRouter(prefix="/tournament/bracket", tags=["Brackets"])
+routers = (router, )
+
+
+async def get_bracket_by_tournament(session: AsyncSession, tournament_id: int) -> BracketORM | None:
+    return (await session.execute(
+        select(
+            BracketORM
+        ).options(
+            *bracket_loader_options()
+        ).where(
+            BracketORM.tournament_id == tournament_id
+        )
+    )).scalar_one_or_none()
+
+
+@router.get("/")
+async def get_bracket(
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        tournament_id: Annotated[int, Query()]
+) -> SBracket | None:
+    return await get_bracket_by_tournament(session, tournament_id)
+
+
+@router.post("/", description="Generate the full bracket from the accepted members and start the tournament")
+async def post_bracket(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
+        bracket: SBracketAdd
+) -> SBracket:
+    tournament = (await session.execute(
+        select(
+            TournamentORM
+        ).where(
+            TournamentORM.id == bracket.tournament_id
+        ).with_for_update()
+    )).scalar_one_or_none()
+
+    if tournament is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tournament with ID {bracket.tournament_id} does not exist"
+        )
+
+    if tournament.status != ETournamentStatus.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tournament with ID {bracket.tournament_id} has already started"
+        )
+
+    # Seeds are refreshed here too, so members accepted since the last seeding are placed
+    team_ids = [seed.team_id for seed in await seed_tournament(session, tournament.id, tournament.game_id)]
+
+    if len(team_ids) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least two accepted teams are required"
+        )
+
+    await create_bracket(session, tournament.id, bracket.format, team_ids, bracket.rounds)
+
+    await session.execute(
+        update(
+            TournamentORM
+        ).where(
+            TournamentORM.id == tournament.id
+        ).values(
+            status=ETournamentStatus.ACTIVE
+        )
+    )
+
+    await session.commit()
+    await response_cache.invalidate(f"tournament:{tournament.id}", "tournaments", "matches")
+
+    return await get_bracket_by_tournament(session, tournament.id)
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.matches.enums import EMatchStatus
+
+from .enums import EBracketFormat, EBracketSide
+
+
+class SBracketAdd(BaseModel):
+    tournament_id: int
+    format: EBracketFormat
+    rounds: int | None = Field(default=None, ge=1)
+
+
+class SBracketMatchState(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    status: EMatchStatus
+    team_winner_id: int | None = None
+
+
+class SBracketMatch(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    match_id: int
+    side: EBracketSide
+    round: int
+    position: int
+    first_team_id: int | None = None
+    second_team_id: int | None = None
+    next_match_id: int | None = None
+    next_slot: int | None = None
+    loser_match_id: int | None = None
+    loser_slot: int | None = None
+
+    match: SBracketMatchState
+
+
+class SBracket(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    id: int
+    tournament_id: int
+    format: EBracketFormat
+    rounds: int
+
+    matches: list[SBracketMatch]
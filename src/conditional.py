@@ -0,0 +1,111 @@
+import hashlib
+import inspect
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import wraps
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+
+@dataclass
+class Version:
+    updated_at: datetime | None
+    count: int = 1
+    # For list pages, the ids in the window: a row can enter or leave it without changing the max or the count
+    ids: tuple[int, ...] = ()
+
+    @property
+    def last_modified(self) -> datetime | None:
+        if self.updated_at is None:
+            return None
+
+        # Columns are naive UTC timestamps and HTTP dates only carry whole seconds
+        return self.updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+
+    @property
+    def etag(self) -> str:
+        stamp = "" if self.updated_at is None else self.updated_at.isoformat()
+
+        ids = ",".join(map(str, self.ids))
+
+        return 'W/"' + hashlib.sha1(f"{stamp}|{self.count}|{ids}".encode("ascii")).hexdigest()[:20] + '"'
+
+
+# The version the response is being built for, so a cached body is only reused for the same version
+current_version: ContextVar[Version | None] = ContextVar("current_version", default=None)
+
+
+def latest(*values: datetime | None) -> datetime | None:
+    return max((value for value in values if value is not None), default=None)
+
+
+def is_not_modified(request: Request, version: Version) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+
+        # Weak comparison, as required for If-None-Match
+        return "*" in tags or version.etag in tags or version.etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since is None or version.last_modified is None:
+        return False
+
+    try:
+        return version.last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def conditional(get_version: Callable[..., Awaitable[Version | None]]):
+    def decorator(func):
+        signature = inspect.signature(func)
+        version_parameters = inspect.signature(get_version).parameters
+
+        @wraps(func)
+        async def wrapper(*args, _conditional_request: Request, _conditional_response: Response, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+
+            version = await get_version(**{
+                name: value for name, value in arguments.arguments.items() if name in version_parameters
+            })
+
+            if version is None:
+                return await func(*args, **kwargs)
+
+            headers = {"ETag": version.etag, "Cache-Control": "no-cache"}
+
+            if version.last_modified is not None:
+                headers["Last-Modified"] = format_datetime(version.last_modified, usegmt=True)
+
+            if is_not_modified(_conditional_request, version):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            token = current_version.set(version)
+
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                current_version.reset(token)
+
+            response = result if isinstance(result, Response) else _conditional_response
+            response.headers.update(headers)
+
+            return result
+
+        # FastAPI reads the signature to resolve dependencies, so the request is injected through it
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("_conditional_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("_conditional_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+        ])
+
+        return wrapper
+
+    return decorator
@@ -15,7 +15,62 @@ DB_HOST = environ.get("DB_HOST")
 DB_PORT = environ.get("DB_PORT")
 DB_NAME = environ.get("DB_NAME")
 
+DB_POOL_SIZE = int(environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT = int(environ.get("DB_STATEMENT_TIMEOUT", 0))
+DB_STATEMENT_CACHE_SIZE = int(environ.get("DB_STATEMENT_CACHE_SIZE", 100))
+
+DB_READ_HOST = environ.get("DB_READ_HOST")
+DB_READ_PORT = environ.get("DB_READ_PORT", DB_PORT)
+DB_READ_STICKY_SECONDS = int(environ.get("DB_READ_STICKY_SECONDS", 5))
+
 JWT_SECRET = environ.get("JWT_SECRET")
 
 AWS_ACCESS_KEY = environ.get("AWS_ACCESS_KEY")
 AWS_SECRET_KEY = environ.get("AWS_SECRET_KEY")
+
+PASSWORD_HASH_WORKERS = int(environ.get("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_PENDING = int(environ.get("PASSWORD_HASH_MAX_PENDING", 64))
+PASSWORD_HASH_USE_PROCESSES = environ.get("PASSWORD_HASH_EXECUTOR", "thread") == "process"
+
+USER_CACHE_SIZE = int(environ.get("USER_CACHE_SIZE", 1024))
+USER_CACHE_TTL = float(environ.get("USER_CACHE_TTL", 30))
+
+JWT_CACHE_SIZE = int(environ.get("JWT_CACHE_SIZE", 4096))
+JWT_CACHE_TTL = float(environ.get("JWT_CACHE_TTL", 300))
+JWT_NEGATIVE_CACHE_TTL = float(environ.get("JWT_NEGATIVE_CACHE_TTL", 5))
+
+S3_MAX_POOL_CONNECTIONS = int(environ.get("S3_MAX_POOL_CONNECTIONS", 20))
+
+IMAGE_WORKERS = int(environ.get("IMAGE_WORKERS", 2))
+IMAGE_MAX_PIXELS = int(environ.get("IMAGE_MAX_PIXELS", 25_000_000))
+
+UPLOAD_SPOOL_DIR = environ.get("UPLOAD_SPOOL_DIR")
+UPLOAD_CHUNK_SIZE = int(environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+POSTER_MAX_SIZE = int(environ.get("POSTER_MAX_SIZE", 10 * 1024 * 1024))
+S3_MULTIPART_PART_SIZE = int(environ.get("S3_MULTIPART_PART_SIZE", 8 * 1024 * 1024))
+AVATAR_MAX_SIZE = int(environ.get("AVATAR_MAX_SIZE", 2 * 1024 * 1024))
+PRESIGNED_UPLOAD_EXPIRES = int(environ.get("PRESIGNED_UPLOAD_EXPIRES", 600))
+UPLOAD_STAGING_DIR = environ.get("UPLOAD_STAGING_DIR")
+
+OUTBOX_BATCH_SIZE = int(environ.get("OUTBOX_BATCH_SIZE", 10))
+OUTBOX_POLL_INTERVAL = float(environ.get("OUTBOX_POLL_INTERVAL", 1.0))
+OUTBOX_MAX_ATTEMPTS = int(environ.get("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_BACKOFF_BASE = float(environ.get("OUTBOX_BACKOFF_BASE", 2.0))
+OUTBOX_BACKOFF_MAX = float(environ.get("OUTBOX_BACKOFF_MAX", 600.0))
+OUTBOX_LEASE_SECONDS = int(environ.get("OUTBOX_LEASE_SECONDS", 300))
+
+AVATAR_CACHE_DIR = environ.get("AVATAR_CACHE_DIR")
+AVATAR_BASE_URL = environ.get("AVATAR_BASE_URL", "")
+AVATAR_SIZE = int(environ.get("AVATAR_SIZE", 256))
+
+RESPONSE_CACHE_BACKEND = environ.get("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_SIZE = int(environ.get("RESPONSE_CACHE_SIZE", 2048))
+RESPONSE_CACHE_TTL = float(environ.get("RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_REDIS_URL = environ.get("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+RATING_INITIAL = float(environ.get("RATING_INITIAL", 1500))
+RATING_K_FACTOR = float(environ.get("RATING_K_FACTOR", 32))
@@ -1,21 +1,160 @@
+from dataclasses import dataclass, replace
+from time import perf_counter, time
 from typing import AsyncGenerator
 
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from fastapi import Request, Response
+from sqlalchemy import MetaData, update, func
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from src.config import DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME
+from src.config import (DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                        DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT, DB_STATEMENT_CACHE_SIZE,
+                        DB_READ_HOST, DB_READ_PORT, DB_READ_STICKY_SECONDS)
 
 
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+READ_DATABASE_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_READ_HOST}:{DB_READ_PORT}/{DB_NAME}" if DB_READ_HOST else None
+)
+
+STICKY_COOKIE_NAME = "primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.waiters = 0
+        self.checkouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self):
+        self.waiters += 1
+        started_at = perf_counter()
+
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = perf_counter() - started_at
+
+            self.waiters -= 1
+            self.checkouts += 1
+            self.total_wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+
+    def get_metrics(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "waiters": self.waiters,
+            "checkouts": self.checkouts,
+            "avg_wait_time": self.total_wait_time / self.checkouts if self.checkouts else 0.0,
+            "max_wait_time": self.max_wait_time
+        }
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    url: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_timeout: int = 0
+    statement_cache_size: int = 100
+
+    def create_engine(self) -> AsyncEngine:
+        connect_args = {"statement_cache_size": self.statement_cache_size}
+
+        if self.statement_timeout > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(self.statement_timeout)}
+
+        return create_async_engine(
+            self.url,
+            poolclass=InstrumentedPool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args=connect_args
+        )
+
+
+engine_settings = EngineSettings(
+    url=DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    statement_timeout=DB_STATEMENT_TIMEOUT,
+    statement_cache_size=DB_STATEMENT_CACHE_SIZE
+)
 
 metadata = MetaData()
 Base = declarative_base(metadata=metadata)
 
-engine = create_async_engine(DATABASE_URL)
+engine = engine_settings.create_engine()
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = engine if READ_DATABASE_URL is None else replace(engine_settings, url=READ_DATABASE_URL).create_engine()
+async_read_session_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def touch(session: AsyncSession, model, *ids: int):
+    # For changes to child rows, which the parent's onupdate does not see
+    await session.execute(
+        update(
+            model
+        ).where(
+            model.id.in_(ids)
+        ).values(
+            updated_at=func.now()
+        )
+    )
+
+
+def is_sticky_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE_NAME)) > time()
+    except (TypeError, ValueError):
+        return False
+
+
+def is_pinned_to_primary(session: AsyncSession) -> bool:
+    # A read session on the primary while a replica exists serves a request that just wrote
+    return read_engine is not engine and session.bind is engine
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_async_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    session_maker = async_session_maker if is_sticky_to_primary(request) else async_read_session_maker
+
+    async with session_maker() as session:
+        yield session
+
+
+async def sticky_primary_middleware(request: Request, call_next) -> Response:
+    response = await call_next(request)
+
+    if read_engine is not engine and request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            key=STICKY_COOKIE_NAME,
+            value=str(time() + DB_READ_STICKY_SECONDS),
+            max_age=DB_READ_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+
+    return response
@@ -0,0 +1,154 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .config import IMAGE_WORKERS, IMAGE_MAX_PIXELS
+from .s3client import s3_client
+
+
+ALLOWED_FORMATS = ("PNG", "JPEG", "WEBP")
+CONTENT_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+VARIANT_WIDTHS = {"small": 320, "medium": 640, "large": 1280}
+VARIANT_FORMAT = "WEBP"
+
+
+class ImageValidationError(Exception):
+    ...
+
+
+@dataclass
+class ProcessedImage:
+    format: str
+    width: int
+    height: int
+    path: Path
+    variants: dict[str, Path]
+
+    @property
+    def extension(self) -> str:
+        return self.format.lower()
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.format]
+
+
+def render_variants(image: Image.Image, output_dir: Path, variant_widths: dict[str, int]) -> dict[str, Path]:
+    variants = {}
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    for variant, width in variant_widths.items():
+        if width >= image.width:
+            continue
+
+        resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+
+        variants[variant] = output_dir / f"{variant}.{VARIANT_FORMAT.lower()}"
+        resized.save(variants[variant], format=VARIANT_FORMAT, quality=80, method=4)
+
+    return variants
+
+
+def process_image(path: Path, output_dir: Path, allowed_formats: tuple[str, ...], max_pixels: int,
+                  variant_widths: dict[str, int]) -> ProcessedImage:
+    try:
+        with Image.open(path) as image:
+            if image.format not in allowed_formats:
+                raise ImageValidationError(f"Invalid image format. Allowed: {', '.join(allowed_formats)}")
+
+            width, height = image.size
+
+            # Checked on the header, before any pixel data is decoded
+            if width * height > max_pixels:
+                raise ImageValidationError(f"Image is too large. Maximum: {max_pixels} pixels")
+
+            image_format = image.format
+            image = ImageOps.exif_transpose(image)
+
+            output_path = output_dir / f"original.{image_format.lower()}"
+            # Nothing from image.info is passed on, so EXIF, XMP and text chunks are dropped
+            image.save(output_path, format=image_format, quality=90)
+
+            variants = render_variants(image, output_dir, variant_widths)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise ImageValidationError("Invalid image")
+
+    return ProcessedImage(
+        format=image_format,
+        width=image.width,
+        height=image.height,
+        path=output_path,
+        variants=variants
+    )
+
+
+def variant_object_name(stem: str, variant: str) -> str:
+    return f"{stem}_{variant}.{VARIANT_FORMAT.lower()}"
+
+
+async def upload_image_objects(image: ProcessedImage, stem: str,
+                               cache_control: str | None = None) -> tuple[str, dict[str, str]]:
+    object_name = f"{stem}.{image.extension}"
+    variant_object_names = {variant: variant_object_name(stem, variant) for variant in image.variants}
+
+    await asyncio.gather(
+        s3_client.upload_path(image.path, object_name, image.content_type, cache_control),
+        *(
+            s3_client.upload_path(image.variants[variant], name, CONTENT_TYPES[VARIANT_FORMAT], cache_control)
+            for variant, name in variant_object_names.items()
+        )
+    )
+
+    return object_name, variant_object_names
+
+
+async def upload_image(image: ProcessedImage, stem: str,
+                       cache_control: str | None = None) -> tuple[str, dict[str, str]]:
+    object_name, variant_object_names = await upload_image_objects(image, stem, cache_control)
+
+    return s3_client.gen_url(object_name), {
+        variant: s3_client.gen_url(name) for variant, name in variant_object_names.items()
+    }
+
+
+class ImageProcessor:
+    def __init__(self, workers: int = 2, max_pixels: int = 25_000_000,
+                 allowed_formats: tuple[str, ...] = ALLOWED_FORMATS, variant_widths: dict[str, int] = None):
+        self.workers = workers
+        self.max_pixels = max_pixels
+        self.allowed_formats = allowed_formats
+        self.variant_widths = VARIANT_WIDTHS if variant_widths is None else variant_widths
+
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def process(self, path: Path, output_dir: Path) -> ProcessedImage:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, process_image, path, output_dir, self.allowed_formats, self.max_pixels, self.variant_widths
+        )
+
+
+image_processor = ImageProcessor(
+    workers=IMAGE_WORKERS,
+    max_pixels=IMAGE_MAX_PIXELS
+)
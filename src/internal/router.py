@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from src.database import engine, read_engine
+from src.outbox.worker import outbox_worker
+from src.response_cache import response_cache
+from src.auth import auth_manager, password_service, user_cache, jwt_cache, Principal
+
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+routers = (router, )
+
+
+@router.get("/metrics")
+async def get_metrics(_: Annotated[Principal, Depends(auth_manager.current_administrator_principal)]):
+    return {
+        "password": password_service.get_metrics(),
+        "user_cache": user_cache.get_metrics(),
+        "jwt_cache": jwt_cache.get_metrics() if jwt_cache is not None else None,
+        "database": engine.pool.get_metrics(),
+        "database_read": read_engine.pool.get_metrics() if read_engine is not engine else None,
+        "outbox": outbox_worker.get_metrics(),
+        "response_cache": response_cache.get_metrics()
+    }
@@ -1,15 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 
+from .database import engine, read_engine, sticky_primary_middleware
+from .auth import password_service
+from .s3client import s3_client
+from .images import image_processor
+from .outbox.worker import outbox_worker
+from .response_cache import response_cache
 from .auth.router import routers as auth_routers
 from .admin.router import routers as admin_routers
 from .users.router import routers as users_routers
 from .teams.router import routers as teams_routers
 from .matches.router import routers as matches_routers
 from .tournaments.router import routers as tournaments_routers
+from .uploads.router import routers as uploads_routers
+from .avatars.router import routers as avatars_routers
+from .brackets.router import routers as brackets_routers
+from .standings.router import routers as standings_routers
+from .ratings.router import routers as ratings_routers
+from .internal.router import routers as internal_routers
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await s3_client.start()
+    await outbox_worker.start()
+
+    yield
 
+    await outbox_worker.stop()
+    await s3_client.close()
+    await response_cache.close()
+    password_service.shutdown()
+    image_processor.shutdown()
+    await engine.dispose()
 
-app = FastAPI()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:5174",
@@ -27,6 +59,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(sticky_primary_middleware)
+
 
 def app_include_routers(_app: FastAPI, routers: list[APIRouter]):
     for router in routers:
@@ -39,3 +73,9 @@ app_include_routers(app, users_routers)
 app_include_routers(app, teams_routers)
 app_include_routers(app, matches_routers)
 app_include_routers(app, tournaments_routers)
+app_include_routers(app, uploads_routers)
+app_include_routers(app, avatars_routers)
+app_include_routers(app, brackets_routers)
+app_include_routers(app, standings_routers)
+app_include_routers(app, ratings_routers)
+app_include_routers(app, internal_routers)
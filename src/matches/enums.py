@@ -11,3 +11,4 @@ class EMatchStatus(IntEnum):
     in_progress = 1
     finished = 2
     cancelled = 3
+    waiting = 4
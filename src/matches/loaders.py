@@ -0,0 +1,25 @@
+from sqlalchemy.orm import selectinload, joinedload
+
+from src.teams.models import TeamMemberORM
+from src.teams.loaders import team_loader_options
+
+from .models import MatchORM, MatchMemberORM
+
+
+def match_loader_options() -> list:
+    return [
+        selectinload(
+            MatchORM.members
+        ).joinedload(
+            MatchMemberORM.team
+        ).options(
+            *team_loader_options()
+        ),
+        selectinload(
+            MatchORM.members
+        ).selectinload(
+            MatchMemberORM.stack
+        ).joinedload(
+            TeamMemberORM.user
+        )
+    ]
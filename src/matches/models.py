@@ -2,7 +2,7 @@ from typing import List
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, ForeignKeyConstraint, PrimaryKeyConstraint, Integer, func
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, PrimaryKeyConstraint, Integer, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -24,6 +24,7 @@ class MatchORM(Base):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     started_at: Mapped[datetime] = mapped_column(nullable=True)
     finished_at: Mapped[datetime] = mapped_column(nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
     members: Mapped[list["MatchMemberORM"]] = relationship()
 
@@ -73,3 +74,8 @@ class MatchStackORM(Base):
     )  # Sell my soul
 
     # member: Mapped[TeamMemberORM] = relationship(overlaps="stack")
+
+
+Index("ix_Match_status", MatchORM.status)
+Index("ix_Match_created_at_id", MatchORM.created_at, MatchORM.id)
+Index("ix_MatchMember_team_id", MatchMemberORM.team_id)
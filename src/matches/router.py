@@ -1,17 +1,21 @@
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import insert, select, update, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Select, insert, select, update, func, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth import auth_manager
-from src.database import get_async_session
-from src.users.models import UserORM
-from src.teams.models import TeamORM, TeamMemberORM
+from src.auth import auth_manager, Principal
+from src.database import get_async_session, get_async_read_session
+from src.pagination import SPage, Pagination
+from src.response_cache import response_cache
+from src.conditional import Version, conditional, latest
+from src.teams.models import TeamORM
+from src.brackets.advancement import lock_bracket_match, advance_bracket
+from src.ratings.updates import rate_result
 
 from .schemas import SMatchAdd, SMatchEdit, SMatch
 from .models import MatchORM, MatchMemberORM
+from .loaders import match_loader_options
 from .enums import EMatchType, EMatchStatus
 
 
@@ -20,53 +24,127 @@ matches_router = APIRouter(prefix="/matches", tags=["Matches"])
 routers = (match_router, matches_router)
 
 
+def match_tags(match: MatchORM | None) -> list[str]:
+    if match is None:
+        return ["matches"]
+
+    return [f"match:{match.id}", *(f"team:{member.team.id}" for member in match.members)]
+
+
+def filter_matches(
+        query: Select,
+        status: EMatchStatus | None,
+        type: EMatchType | None,
+        team_id: int | None
+) -> Select:
+    if status is not None:
+        query = query.where(MatchORM.status == status)
+
+    if type is not None:
+        query = query.where(MatchORM.type == type)
+
+    if team_id is not None:
+        query = query.where(
+            MatchORM.id.in_(
+                select(
+                    MatchMemberORM.match_id
+                ).where(
+                    MatchMemberORM.team_id == team_id
+                )
+            )
+        )
+
+    return query
+
+
+async def match_version(session: AsyncSession, id: int) -> Version | None:
+    row = (await session.execute(
+        select(
+            MatchORM.updated_at, func.max(TeamORM.updated_at)
+        ).outerjoin(
+            MatchMemberORM, MatchMemberORM.match_id == MatchORM.id
+        ).outerjoin(
+            TeamORM, TeamORM.id == MatchMemberORM.team_id
+        ).where(
+            MatchORM.id == id
+        ).group_by(
+            MatchORM.id
+        )
+    )).one_or_none()
+
+    return None if row is None else Version(latest(*row))
+
+
+async def matches_version(
+        session: AsyncSession,
+        pagination: Pagination,
+        status: EMatchStatus | None = None,
+        type: EMatchType | None = None,
+        team_id: int | None = None,
+        sort: Literal["id", "created_at"] = "id"
+) -> Version:
+    columns = (MatchORM.id, ) if sort == "id" else (MatchORM.created_at, MatchORM.id)
+    page = pagination.apply(
+        filter_matches(select(MatchORM.id, MatchORM.created_at, MatchORM.updated_at), status, type, team_id),
+        *columns
+    ).subquery()
+
+    # Sort keys never change, so the sorted id set identifies the page
+    matches_updated_at, teams_updated_at, count, ids = (await session.execute(
+        select(
+            func.max(page.c.updated_at),
+            func.max(TeamORM.updated_at),
+            func.count(distinct(page.c.id)),
+            func.array_agg(distinct(page.c.id))
+        ).select_from(
+            page
+        ).outerjoin(
+            MatchMemberORM, MatchMemberORM.match_id == page.c.id
+        ).outerjoin(
+            TeamORM, TeamORM.id == MatchMemberORM.team_id
+        )
+    )).one()
+
+    return Version(latest(matches_updated_at, teams_updated_at), count, tuple(ids or ()))
+
+
 @match_router.get("/", response_model=Optional[SMatch])
+@conditional(match_version)
+@response_cache.cached("match", Optional[SMatch], match_tags)
 async def get_match(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
         id: int
 ):
     return (await session.execute(
         select(
             MatchORM
         ).options(
-            joinedload(
-                MatchORM.members
-            ).joinedload(
-                MatchMemberORM.team
-            ).joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            ),
-            joinedload(
-                MatchORM.members
-            ).joinedload(
-                MatchMemberORM.stack
-            ).joinedload(
-                TeamMemberORM.user
-            )
+            *match_loader_options()
         ).where(
             MatchORM.id == id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
 
 @match_router.patch("/", response_model=SMatch)
 async def edit_match(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         data: SMatchEdit
 ):
     bad_request_exc = HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST
     )
 
+    closing = data.status in (EMatchStatus.finished, EMatchStatus.cancelled)
+    bracket_match = await lock_bracket_match(session, data.match_id) if closing else None
+
     match = (await session.execute(
         select(
             MatchORM
         ).where(
             MatchORM.id == data.match_id
-        )
+        ).with_for_update()
     )).scalar_one_or_none()
 
     if match is None:
@@ -115,31 +193,59 @@ async def edit_match(
         if match.status == EMatchStatus.finished:
             raise bad_request_exc
 
+        if bracket_match is not None:
+            if match.status == EMatchStatus.waiting:
+                bad_request_exc.detail = "The match is still waiting for its teams"
+                raise bad_request_exc
+            if data.winner_id is not None and data.winner_id not in match_members_ids:
+                bad_request_exc.detail = f"Team with ID {data.winner_id} does not participate in the match"
+                raise bad_request_exc
+            if data.winner_id is None and bracket_match.next_match_id is not None:
+                bad_request_exc.detail = "A bracket match can only be cancelled with a winner, who advances by walkover"
+                raise bad_request_exc
+
         values = {"status": data.status, "team_winner_id": data.winner_id, "finished_at": func.now()}
     else:
         raise bad_request_exc
 
-    result = (await session.execute(
+    await session.execute(
         update(
             MatchORM
         ).where(
             MatchORM.id == data.match_id
         ).values(
             **values
-        ).returning(
-            MatchORM
         )
-    )).scalar_one()
+    )
+
+    tags = [f"match:{data.match_id}"]
+
+    if bracket_match is not None:
+        tags.extend(await advance_bracket(session, bracket_match, data.winner_id))
+
+        if data.status == EMatchStatus.finished:
+            await rate_result(session, bracket_match, data.winner_id)
 
     await session.commit()
+    await response_cache.invalidate(*tags)
 
-    return result
+    return (await session.execute(
+        select(
+            MatchORM
+        ).options(
+            *match_loader_options()
+        ).where(
+            MatchORM.id == data.match_id
+        ).execution_options(
+            populate_existing=True
+        )
+    )).scalar_one()
 
 
 @match_router.post("/competitive", response_model=SMatch)
 async def post_competitive_match(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         data: SMatchAdd
 ):
     teams_ids = (data.first_team_id, data.second_team_id)
@@ -180,42 +286,41 @@ async def post_competitive_match(
     )
 
     await session.commit()
+    await response_cache.invalidate("matches")
 
     r = (await session.execute(
         select(
             MatchORM
         ).options(
-            joinedload(
-                MatchORM.members
-            ).joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            )
+            *match_loader_options()
         ).where(
             MatchORM.id == match.id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     return r
 
 
-@matches_router.get("/", response_model=list[SMatch])
+@matches_router.get("/", response_model=SPage[SMatch])
+@conditional(matches_version)
 async def get_matches(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        pagination: Annotated[Pagination, Depends()],
+        status: EMatchStatus | None = None,
+        type: EMatchType | None = None,
+        team_id: int | None = None,
+        sort: Literal["id", "created_at"] = "id"
 ):
-    return (await session.execute(
-        select(
-            MatchORM
-        ).options(
-            joinedload(
-                MatchORM.members
-            ).joinedload(
-                MatchMemberORM.team
-            ).joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            )
-        )
-    )).unique().scalars().all()
+    columns = (MatchORM.id, ) if sort == "id" else (MatchORM.created_at, MatchORM.id)
+
+    query = filter_matches(select(
+        MatchORM
+    ).options(
+        *match_loader_options()
+    ), status, type, team_id)
+
+    matches = (await session.execute(
+        pagination.apply(query, *columns)
+    )).scalars().all()
+
+    return pagination.page(matches, *columns)
@@ -0,0 +1,8 @@
+from enum import IntEnum
+
+
+class EOutboxStatus(IntEnum):
+    PENDING = 0
+    PROCESSING = 1
+    DONE = 2
+    FAILED = 3
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, JSON, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+from .enums import EOutboxStatus
+
+
+class OutboxORM(Base):
+    __tablename__ = "Outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(length=64))
+    payload: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[EOutboxStatus] = mapped_column(Integer, default=EOutboxStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str] = mapped_column(String(length=512), nullable=True)
+    available_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+
+Index("ix_Outbox_status_available_at", OutboxORM.status, OutboxORM.available_at)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database import async_session_maker
+from src.config import (OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL, OUTBOX_MAX_ATTEMPTS, OUTBOX_BACKOFF_BASE,
+                        OUTBOX_BACKOFF_MAX, OUTBOX_LEASE_SECONDS)
+
+from .models import OutboxORM
+from .enums import EOutboxStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxHandler:
+    handle: Callable[[AsyncSession, dict], Awaitable[None]]
+    on_failure: Callable[[AsyncSession, dict], Awaitable[None]] | None = None
+    finalize: Callable[[dict], Awaitable[None]] | None = None
+
+
+async def enqueue(session: AsyncSession, kind: str, payload: dict) -> int:
+    # Written in the caller's transaction, so the message exists only if that transaction commits
+    return (await session.execute(
+        insert(
+            OutboxORM
+        ).values(
+            kind=kind,
+            payload=payload
+        ).returning(
+            OutboxORM.id
+        )
+    )).scalar_one()
+
+
+class OutboxWorker:
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            batch_size: int = 10,
+            poll_interval: float = 1.0,
+            max_attempts: int = 8,
+            backoff_base: float = 2.0,
+            backoff_max: float = 600.0,
+            lease_seconds: int = 300
+    ):
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+
+        self.handlers: dict[str, OutboxHandler] = {}
+        self.metrics = {"done": 0, "retried": 0, "failed": 0}
+
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def register(self, kind: str, handler: OutboxHandler):
+        self.handlers[kind] = handler
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                # Waits out the poll interval before retrying, so a broken database does not spin
+                logger.exception("Outbox batch failed")
+                processed = 0
+
+            if processed:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> list:
+        # Claimed rows get a lease instead of staying locked, so no transaction is held open during the work.
+        # A worker that dies mid-message leaves it to be picked up again once the lease expires.
+        claimable = select(
+            OutboxORM.id
+        ).where(
+            OutboxORM.status.in_((EOutboxStatus.PENDING, EOutboxStatus.PROCESSING)),
+            OutboxORM.available_at <= func.now()
+        ).order_by(
+            OutboxORM.available_at
+        ).limit(
+            self.batch_size
+        ).with_for_update(
+            skip_locked=True
+        ).scalar_subquery()
+
+        async with self.session_maker() as session:
+            rows = (await session.execute(
+                update(
+                    OutboxORM
+                ).where(
+                    OutboxORM.id.in_(claimable)
+                ).values(
+                    status=EOutboxStatus.PROCESSING,
+                    attempts=OutboxORM.attempts + 1,
+                    available_at=func.now() + timedelta(seconds=self.lease_seconds)
+                ).returning(
+                    OutboxORM.id, OutboxORM.kind, OutboxORM.payload, OutboxORM.attempts
+                )
+            )).all()
+
+            await session.commit()
+
+        return rows
+
+    async def process_batch(self) -> int:
+        rows = await self._claim()
+
+        await asyncio.gather(*(self._process(*row) for row in rows))
+
+        return len(rows)
+
+    async def _process(self, message_id: int, kind: str, payload: dict, attempts: int):
+        handler = self.handlers.get(kind)
+
+        async with self.session_maker() as session:
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for {kind}")
+
+                await handler.handle(session, payload)
+
+                await session.execute(
+                    update(OutboxORM).where(OutboxORM.id == message_id).values(status=EOutboxStatus.DONE)
+                )
+                await session.commit()
+
+                self.metrics["done"] += 1
+            except Exception as e:
+                await session.rollback()
+                await self._fail(session, message_id, handler, payload, attempts, e)
+
+                if attempts < self.max_attempts:
+                    return
+
+        if handler is not None and handler.finalize is not None:
+            await handler.finalize(payload)
+
+    async def _fail(self, session: AsyncSession, message_id: int, handler: OutboxHandler | None, payload: dict,
+                    attempts: int, error: Exception):
+        values = {"last_error": repr(error)[:512]}
+
+        if attempts < self.max_attempts:
+            values["status"] = EOutboxStatus.PENDING
+            values["available_at"] = func.now() + timedelta(seconds=self.backoff(attempts))
+            self.metrics["retried"] += 1
+        else:
+            values["status"] = EOutboxStatus.FAILED
+            self.metrics["failed"] += 1
+
+            if handler is not None and handler.on_failure is not None:
+                await handler.on_failure(session, payload)
+
+        await session.execute(update(OutboxORM).where(OutboxORM.id == message_id).values(values))
+        await session.commit()
+
+    def get_metrics(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            **self.metrics
+        }
+
+
+outbox_worker = OutboxWorker(
+    async_session_maker,
+    batch_size=OUTBOX_BATCH_SIZE,
+    poll_interval=OUTBOX_POLL_INTERVAL,
+    max_attempts=OUTBOX_MAX_ATTEMPTS,
+    backoff_base=OUTBOX_BACKOFF_BASE,
+    backoff_max=OUTBOX_BACKOFF_MAX,
+    lease_seconds=OUTBOX_LEASE_SECONDS
+)
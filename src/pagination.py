@@ -0,0 +1,86 @@
+import json
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from datetime import datetime
+from typing import Annotated, Any, Generic, Literal, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+T = TypeVar("T")
+
+
+class SPage(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def like_prefix(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class Pagination:
+    def __init__(
+            self,
+            limit: Annotated[int, Query(ge=1, le=100)] = 20,
+            cursor: Annotated[str | None, Query()] = None,
+            order: Annotated[Literal["asc", "desc"], Query()] = "asc"
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.order = order
+
+    def cache_key(self) -> list:
+        return [self.limit, self.cursor, self.order]
+
+    @staticmethod
+    def encode_cursor(values: Sequence[Any]) -> str:
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+
+        return urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+        invalid_cursor_exc = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+        try:
+            values = json.loads(urlsafe_b64decode(self.cursor.encode("ascii")))
+        except ValueError:
+            raise invalid_cursor_exc
+
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise invalid_cursor_exc
+
+        try:
+            return [
+                datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+        except (TypeError, ValueError):
+            raise invalid_cursor_exc
+
+    def apply(self, query: Select, *columns: InstrumentedAttribute) -> Select:
+        # The last column must be unique, otherwise rows sharing a key would be skipped
+        if self.cursor is not None:
+            values = self.decode_cursor(columns)
+            key, value = (columns[0], values[0]) if len(columns) == 1 else (tuple_(*columns), tuple_(*values))
+
+            query = query.where(key > value if self.order == "asc" else key < value)
+
+        return query.order_by(
+            *(column.asc() if self.order == "asc" else column.desc() for column in columns)
+        ).limit(self.limit + 1)
+
+    def page(self, items: Sequence[Any], *columns: InstrumentedAttribute) -> dict:
+        items = list(items)
+        next_cursor = None
+
+        if len(items) > self.limit:
+            items = items[:self.limit]
+            next_cursor = self.encode_cursor([getattr(items[-1], column.key) for column in columns])
+
+        return {"items": items, "next_cursor": next_cursor}
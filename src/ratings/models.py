@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+from src.teams.models import TeamORM
+from src.tournaments.models import GameORM
+
+
+class RatingORM(Base):
+    __tablename__ = "Rating"
+
+    game_id: Mapped[int] = mapped_column(
+        ForeignKey(GameORM.__tablename__ + ".id", ondelete="cascade"),
+        primary_key=True
+    )
+    team_id: Mapped[int] = mapped_column(
+        ForeignKey(TeamORM.__tablename__ + ".id", ondelete="cascade"),
+        primary_key=True
+    )
+
+    rating: Mapped[float] = mapped_column()
+    matches: Mapped[int] = mapped_column(default=0)
+    wins: Mapped[int] = mapped_column(default=0)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+
+# Leaderboards page through a game's ratings from the top, keyed on (rating, team_id)
+Index("ix_Rating_game_id_rating_team_id", RatingORM.game_id, RatingORM.rating, RatingORM.team_id)
@@ -0,0 +1,116 @@
+import numpy as np
+from sqlalchemy import select, delete, insert, case, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import RATING_INITIAL, RATING_K_FACTOR
+from src.matches.models import MatchORM
+from src.matches.enums import EMatchStatus
+from src.brackets.models import BracketORM, BracketMatchORM
+from src.tournaments.models import TournamentORM
+
+from .models import RatingORM
+from .schemas import SRatingsRecompute
+
+
+def rating_waves(winner_index: np.ndarray, loser_index: np.ndarray, size: int) -> np.ndarray:
+    # A match goes one wave after the latest earlier match of either team, so no team appears twice in a wave
+    # and replaying wave by wave gives exactly the sequential result
+    last = [0] * size
+    waves = []
+
+    for winner, loser in zip(winner_index.tolist(), loser_index.tolist()):
+        wave = max(last[winner], last[loser])
+        waves.append(wave)
+        last[winner] = last[loser] = wave + 1
+
+    return np.array(waves, dtype=np.int64)
+
+
+def replay_ratings(matches: np.ndarray) -> tuple[np.ndarray, np.ndarray, int]:
+    # Rows of (game_id, winner_id, loser_id) in chronological order; returns the (game_id, team_id) keys,
+    # their (rating, matches, wins) and the number of waves
+    game, winner, loser = matches.T
+
+    keys, inverse = np.unique(
+        np.concatenate([np.stack([game, winner], axis=1), np.stack([game, loser], axis=1)]),
+        axis=0,
+        return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    winner_index, loser_index = inverse[:len(matches)], inverse[len(matches):]
+
+    size = len(keys)
+    ratings = np.full(size, RATING_INITIAL)
+    waves = rating_waves(winner_index, loser_index, size)
+
+    order = np.argsort(waves, kind="stable")
+    bounds = np.flatnonzero(np.diff(waves[order])) + 1
+
+    for wave in np.split(order, bounds) if len(order) else []:
+        winners, losers = winner_index[wave], loser_index[wave]
+        expected = 1 / (1 + 10 ** ((ratings[losers] - ratings[winners]) / 400))
+        change = RATING_K_FACTOR * (1 - expected)
+
+        ratings[winners] += change
+        ratings[losers] -= change
+
+    played = np.bincount(winner_index, minlength=size) + np.bincount(loser_index, minlength=size)
+    wins = np.bincount(winner_index, minlength=size)
+
+    return keys, np.stack([ratings, played, wins], axis=1), len(bounds) + 1 if len(order) else 0
+
+
+async def recompute_ratings(session: AsyncSession, game_id: int | None = None) -> SRatingsRecompute:
+    # Online updates block until this commits and then apply on top of the rebuilt table
+    await session.execute(text('LOCK TABLE "Rating" IN EXCLUSIVE MODE'))
+
+    scope = [] if game_id is None else [TournamentORM.game_id == game_id]
+
+    rows = (await session.execute(
+        select(
+            TournamentORM.game_id,
+            MatchORM.team_winner_id,
+            case(
+                (MatchORM.team_winner_id == BracketMatchORM.first_team_id, BracketMatchORM.second_team_id),
+                else_=BracketMatchORM.first_team_id
+            )
+        ).join(
+            BracketORM, BracketORM.tournament_id == TournamentORM.id
+        ).join(
+            BracketMatchORM, BracketMatchORM.bracket_id == BracketORM.id
+        ).join(
+            MatchORM, MatchORM.id == BracketMatchORM.match_id
+        ).where(
+            *scope,
+            MatchORM.status == EMatchStatus.finished,
+            BracketMatchORM.second_team_id.is_not(None)
+        ).order_by(
+            MatchORM.finished_at, MatchORM.id
+        )
+    )).tuples().all()
+
+    keys, stats, waves = replay_ratings(np.array(rows, dtype=np.int64).reshape(-1, 3))
+
+    await session.execute(
+        delete(
+            RatingORM
+        ).where(
+            *([] if game_id is None else [RatingORM.game_id == game_id])
+        )
+    )
+
+    if len(keys):
+        await session.execute(
+            insert(RatingORM),
+            [
+                {"game_id": game, "team_id": team, "rating": rating, "matches": int(played), "wins": int(wins)}
+                for (game, team), (rating, played, wins) in zip(keys.tolist(), stats.tolist())
+            ]
+        )
+
+    return SRatingsRecompute(
+        games=len(np.unique(keys[:, 0])),
+        teams=len(keys),
+        matches=len(rows),
+        waves=waves
+    )
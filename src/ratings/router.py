@@ -0,0 +1,58 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session, get_async_read_session
+from src.auth import auth_manager, Principal
+from src.pagination import SPage, Pagination
+
+from .models import RatingORM
+from .schemas import SRating, SRatingsRecompute
+from .rebuild import recompute_ratings
+
+
+router = APIRouter(prefix="/ratings", tags=["Ratings"])
+routers = (router, )
+
+
+def leaderboard_pagination(
+        limit: Annotated[int, Query(ge=1, le=100)] = 20,
+        cursor: Annotated[str | None, Query()] = None
+) -> Pagination:
+    return Pagination(limit, cursor, "desc")
+
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        pagination: Annotated[Pagination, Depends(leaderboard_pagination)],
+        game_id: Annotated[int, Query()]
+) -> SPage[SRating]:
+    columns = (RatingORM.rating, RatingORM.team_id)
+
+    ratings = (await session.execute(
+        pagination.apply(
+            select(
+                RatingORM
+            ).where(
+                RatingORM.game_id == game_id
+            ),
+            *columns
+        )
+    )).scalars().all()
+
+    return pagination.page(ratings, *columns)
+
+
+@router.post("/recompute", description="Replay every finished bracket match in order and rewrite the ratings")
+async def post_recompute(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
+        game_id: Annotated[int | None, Query()] = None
+) -> SRatingsRecompute:
+    result = await recompute_ratings(session, game_id)
+    await session.commit()
+
+    return result
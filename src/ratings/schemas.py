@@ -0,0 +1,20 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class SRating(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    game_id: int
+    team_id: int
+    rating: float
+    matches: int
+    wins: int
+
+
+class SRatingsRecompute(BaseModel):
+    games: int
+    teams: int
+    matches: int
+    waves: int
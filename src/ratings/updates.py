@@ -0,0 +1,77 @@
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import RATING_INITIAL, RATING_K_FACTOR
+from src.brackets.models import BracketORM, BracketMatchORM
+from src.tournaments.models import TournamentORM
+
+from .models import RatingORM
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def rating_change(winner_rating: float, loser_rating: float) -> float:
+    return RATING_K_FACTOR * (1 - expected_score(winner_rating, loser_rating))
+
+
+async def rate_result(session: AsyncSession, bracket_match: BracketMatchORM, winner_id: int):
+    # Only played matches are rated: a walkover says nothing about skill
+    if bracket_match.second_team_id is None:
+        return
+
+    loser_id = bracket_match.second_team_id if winner_id == bracket_match.first_team_id \
+        else bracket_match.first_team_id
+
+    game_id = await session.scalar(
+        select(
+            TournamentORM.game_id
+        ).join(
+            BracketORM, BracketORM.tournament_id == TournamentORM.id
+        ).where(
+            BracketORM.id == bracket_match.bracket_id
+        )
+    )
+
+    await session.execute(
+        insert(
+            RatingORM
+        ).values(
+            [{"game_id": game_id, "team_id": team_id, "rating": RATING_INITIAL} for team_id in (winner_id, loser_id)]
+        ).on_conflict_do_nothing(
+            index_elements=[RatingORM.game_id, RatingORM.team_id]
+        )
+    )
+
+    # Teams can play in several tournaments of a game at once, so both rows are locked in a fixed order
+    ratings = dict((await session.execute(
+        select(
+            RatingORM.team_id, RatingORM.rating
+        ).where(
+            RatingORM.game_id == game_id,
+            RatingORM.team_id.in_((winner_id, loser_id))
+        ).order_by(
+            RatingORM.team_id
+        ).with_for_update()
+    )).tuples().all())
+
+    change = rating_change(ratings[winner_id], ratings[loser_id])
+
+    for team_id, rating, wins in (
+            (winner_id, ratings[winner_id] + change, 1),
+            (loser_id, ratings[loser_id] - change, 0)
+    ):
+        await session.execute(
+            update(
+                RatingORM
+            ).where(
+                RatingORM.game_id == game_id,
+                RatingORM.team_id == team_id
+            ).values(
+                rating=rating,
+                matches=RatingORM.matches + 1,
+                wins=RatingORM.wins + wins
+            )
+        )
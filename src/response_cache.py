@@ -0,0 +1,236 @@
+import inspect
+import json
+from dataclasses import dataclass
+from enum import Enum
+from functools import wraps
+from time import time
+from typing import Any, Callable, Iterable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .database import is_pinned_to_primary
+from .conditional import current_version
+from .config import RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_REDIS_URL
+
+
+@dataclass
+class CachedResponse:
+    created_at: float
+    tags: list[str]
+    body: bytes
+
+
+class MemoryResponseCacheBackend:
+    def __init__(self, maxsize: int = 2048, ttl: float = 60):
+        self.ttl = ttl
+        self.entries = TTLCache(maxsize, ttl)
+        self.tag_times: dict[str, float] = {}
+
+    async def get(self, key: str) -> CachedResponse | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, entry: CachedResponse):
+        self.entries.set(key, entry)
+
+    async def get_tag_times(self, tags: list[str]) -> list[float | None]:
+        return [self.tag_times.get(tag) for tag in tags]
+
+    async def touch_tags(self, tags: Iterable[str], timestamp: float):
+        for tag in tags:
+            self.tag_times[tag] = timestamp
+
+        # A tag invalidated longer than a TTL ago cannot be newer than any live entry
+        if len(self.tag_times) > self.entries.maxsize * 4:
+            self.tag_times = {tag: at for tag, at in self.tag_times.items() if at > timestamp - self.ttl}
+
+    async def close(self):
+        self.entries.clear()
+
+    def get_metrics(self) -> dict:
+        return {"backend": "memory", "tags": len(self.tag_times), **self.entries.get_metrics()}
+
+
+class RedisResponseCacheBackend:
+    def __init__(self, url: str, ttl: float = 60, prefix: str = "response_cache:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("The redis response cache backend requires the redis package")
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.redis = redis.from_url(url)
+
+    async def get(self, key: str) -> CachedResponse | None:
+        raw = await self.redis.get(self.prefix + key)
+
+        if raw is None:
+            return None
+
+        header, body = raw.split(b"\n", 1)
+        header = json.loads(header)
+
+        return CachedResponse(created_at=header["created_at"], tags=header["tags"], body=body)
+
+    async def set(self, key: str, entry: CachedResponse):
+        header = json.dumps({"created_at": entry.created_at, "tags": entry.tags}).encode("utf-8")
+
+        await self.redis.set(self.prefix + key, header + b"\n" + entry.body, px=int(self.ttl * 1000))
+
+    async def get_tag_times(self, tags: list[str]) -> list[float | None]:
+        if not tags:
+            return []
+
+        return [None if value is None else float(value) for value in await self.redis.mget(
+            [f"{self.prefix}tag:{tag}" for tag in tags]
+        )]
+
+    async def touch_tags(self, tags: Iterable[str], timestamp: float):
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            for tag in tags:
+                pipeline.set(f"{self.prefix}tag:{tag}", timestamp, px=int(self.ttl * 1000))
+
+            await pipeline.execute()
+
+    async def close(self):
+        await self.redis.aclose()
+
+    def get_metrics(self) -> dict:
+        return {"backend": "redis"}
+
+
+def key_part(value: Any) -> Any:
+    if hasattr(value, "cache_key"):
+        return value.cache_key()
+
+    if isinstance(value, Enum):
+        return value.value
+
+    return value
+
+
+class ResponseCache:
+    def __init__(self, backend: MemoryResponseCacheBackend | RedisResponseCacheBackend | None):
+        self.backend = backend
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.bypassed = 0
+
+    async def invalidate(self, *tags: str):
+        if self.backend is not None:
+            await self.backend.touch_tags(tags, time())
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+    @staticmethod
+    def make_key(name: str, arguments: dict[str, Any]) -> str:
+        return name + ":" + json.dumps(
+            {
+                argument: key_part(value) for argument, value in arguments.items()
+                if not isinstance(value, AsyncSession)
+            },
+            sort_keys=True,
+            default=str
+        )
+
+    async def _get(self, key: str) -> CachedResponse | None:
+        entry = await self.backend.get(key)
+
+        if entry is None:
+            return None
+
+        # Entries are kept on invalidation and rejected here instead, so no key index per tag is needed
+        for invalidated_at in await self.backend.get_tag_times(entry.tags):
+            if invalidated_at is not None and invalidated_at >= entry.created_at:
+                self.stale += 1
+                return None
+
+        return entry
+
+    def cached(self, name: str, model: Any, tags: Callable[[Any], Iterable[str]]):
+        adapter = TypeAdapter(model)
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return await func(*args, **kwargs)
+
+                arguments = signature.bind(*args, **kwargs)
+                arguments.apply_defaults()
+
+                # A request pinned to the primary just wrote, and entries can be refilled from the lagging replica
+                # after the invalidation, so it skips the cache both ways to keep reading its own writes
+                if any(
+                        isinstance(value, AsyncSession) and is_pinned_to_primary(value)
+                        for value in arguments.arguments.values()
+                ):
+                    self.bypassed += 1
+                    return await func(*args, **kwargs)
+
+                key = self.make_key(name, arguments.arguments)
+                version = current_version.get()
+
+                # Under a conditional GET the body must match the ETag sent with it, which comes from a fresh version
+                # query; keying on it turns an entry older than the version, from another worker or a lagging
+                # replica, into a miss instead of an old body served under the new ETag
+                if version is not None:
+                    key += "@" + version.etag
+
+                entry = await self._get(key)
+
+                if entry is not None:
+                    self.hits += 1
+                    return Response(content=entry.body, media_type="application/json")
+
+                self.misses += 1
+
+                # Taken before the query, so an invalidation racing with it still wins
+                created_at = time()
+                result = await func(*args, **kwargs)
+                body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+                await self.backend.set(key, CachedResponse(created_at, sorted(set(tags(result))), body))
+
+                return Response(content=body, media_type="application/json")
+
+            return wrapper
+
+        return decorator
+
+    def get_metrics(self) -> dict | None:
+        if self.backend is None:
+            return None
+
+        requests = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            **self.backend.get_metrics()
+        }
+
+
+def create_backend(name: str) -> MemoryResponseCacheBackend | RedisResponseCacheBackend | None:
+    if name == "memory":
+        return MemoryResponseCacheBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+    if name == "redis":
+        return RedisResponseCacheBackend(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL)
+
+    return None
+
+
+response_cache = ResponseCache(create_backend(RESPONSE_CACHE_BACKEND))
@@ -1,8 +1,12 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, AsyncExitStack
+from pathlib import Path
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
 
-from .config import AWS_SECRET_KEY, AWS_ACCESS_KEY
+from .config import AWS_SECRET_KEY, AWS_ACCESS_KEY, S3_MAX_POOL_CONNECTIONS, S3_MULTIPART_PART_SIZE
 
 
 class S3Client:
@@ -12,44 +16,192 @@ class S3Client:
             secret_key: str,
             endpoint_url: str,
             file_url_template: str,
-            bucket_name: str
+            bucket_name: str,
+            max_pool_connections: int = 10,
+            multipart_part_size: int = 8 * 1024 * 1024
     ):
         self.config = {
             "aws_access_key_id": access_key,
             "aws_secret_access_key": secret_key,
-            "endpoint_url": endpoint_url
+            "endpoint_url": endpoint_url,
+            "config": AioConfig(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={"max_attempts": 3, "mode": "standard"}
+            )
         }
         self.base_file_url = file_url_template.format(bucket_name=bucket_name)
         self.bucket_name = bucket_name
+        self.multipart_part_size = multipart_part_size
         self.session = get_session()
 
+        self._exit_stack: AsyncExitStack | None = None
+        self._client = None
+
     def gen_url(self, object_name: str) -> str:
         return f"{self.base_file_url}/{object_name}"
 
+    async def start(self):
+        if self._client is not None:
+            return
+
+        self._exit_stack = AsyncExitStack()
+        self._client = await self._exit_stack.enter_async_context(self.session.create_client("s3", **self.config))
+
+    async def close(self):
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+
+        self._exit_stack = None
+        self._client = None
+
     @asynccontextmanager
     async def get_client(self):
+        if self._client is not None:
+            yield self._client
+            return
+
         async with self.session.create_client("s3", **self.config) as client:
             yield client
 
     async def upload_file(
             self,
             file: bytes,
-            object_name: str
+            object_name: str,
+            content_type: str | None = None
     ) -> str:
+        extra = {} if content_type is None else {"ContentType": content_type}
+
         async with self.get_client() as client:
             await client.put_object(
                 Bucket=self.bucket_name,
                 Key=object_name,
-                Body=file
+                Body=file,
+                **extra
             )
 
         return self.gen_url(object_name)
 
+    async def upload_path(
+            self,
+            path: Path,
+            object_name: str,
+            content_type: str | None = None,
+            cache_control: str | None = None
+    ) -> str:
+        extra = {} if content_type is None else {"ContentType": content_type}
+
+        if cache_control is not None:
+            extra["CacheControl"] = cache_control
+
+        async with self.get_client() as client:
+            if path.stat().st_size <= self.multipart_part_size:
+                with open(path, "rb") as file:
+                    await client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=object_name,
+                        Body=file,
+                        **extra
+                    )
+            else:
+                await self._upload_multipart(client, path, object_name, extra)
+
+        return self.gen_url(object_name)
+
+    async def _upload_multipart(self, client, path: Path, object_name: str, extra: dict):
+        upload_id = (await client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=object_name,
+            **extra
+        ))["UploadId"]
+
+        parts = []
+
+        try:
+            with open(path, "rb") as file:
+                while chunk := await asyncio.to_thread(file.read, self.multipart_part_size):
+                    part = await client.upload_part(
+                        Bucket=self.bucket_name,
+                        Key=object_name,
+                        PartNumber=len(parts) + 1,
+                        UploadId=upload_id,
+                        Body=chunk
+                    )
+
+                    parts.append({"ETag": part["ETag"], "PartNumber": len(parts) + 1})
+
+            await client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            await client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id
+            )
+            raise
+
+    async def download_path(self, object_name: str, path: Path):
+        async with self.get_client() as client:
+            response = await client.get_object(
+                Bucket=self.bucket_name,
+                Key=object_name
+            )
+
+            async with response["Body"] as body:
+                with open(path, "wb") as file:
+                    while chunk := await body.read(self.multipart_part_size):
+                        await asyncio.to_thread(file.write, chunk)
+
+    async def head_file(self, object_name: str) -> dict | None:
+        async with self.get_client() as client:
+            try:
+                return await client.head_object(
+                    Bucket=self.bucket_name,
+                    Key=object_name
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                    return None
+
+                raise
+
+    async def delete_file(self, object_name: str):
+        async with self.get_client() as client:
+            await client.delete_object(
+                Bucket=self.bucket_name,
+                Key=object_name
+            )
+
+    async def generate_presigned_post(
+            self,
+            object_name: str,
+            content_type: str,
+            max_size: int,
+            expires_in: int = 600
+    ) -> dict:
+        async with self.get_client() as client:
+            return await client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, max_size]
+                ],
+                ExpiresIn=expires_in
+            )
+
 
 s3_client = S3Client(
     access_key=AWS_ACCESS_KEY,
     secret_key=AWS_SECRET_KEY,
     endpoint_url="https://s3.eu-north-1.amazonaws.com",
     file_url_template="https://{bucket_name}.s3.eu-north-1.amazonaws.com",
-    bucket_name="powercup"
+    bucket_name="powercup",
+    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+    multipart_part_size=S3_MULTIPART_PART_SIZE
 )
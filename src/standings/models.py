@@ -0,0 +1,27 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+from src.teams.models import TeamORM
+from src.tournaments.models import TournamentORM
+
+
+class StandingORM(Base):
+    __tablename__ = "Standing"
+
+    tournament_id: Mapped[int] = mapped_column(
+        ForeignKey(TournamentORM.__tablename__ + ".id", ondelete="cascade"),
+        primary_key=True
+    )
+    team_id: Mapped[int] = mapped_column(
+        ForeignKey(TeamORM.__tablename__ + ".id", ondelete="cascade"),
+        primary_key=True
+    )
+
+    played: Mapped[int] = mapped_column(default=0)
+    wins: Mapped[int] = mapped_column(default=0)
+    losses: Mapped[int] = mapped_column(default=0)
+    byes: Mapped[int] = mapped_column(default=0)
+    # A win, walkover or bye is worth a point; Buchholz is the sum of the opponents' points
+    points: Mapped[int] = mapped_column(default=0)
+    buchholz: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,121 @@
+import numpy as np
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.matches.models import MatchORM
+from src.brackets.models import BracketORM, BracketMatchORM
+
+from .models import StandingORM
+from .schemas import SStandingStats, SStandingMismatch, SStandingsRebuild
+
+
+STAT_COLUMNS = ("played", "wins", "losses", "byes", "points", "buchholz")
+
+
+def compute_standings(matches: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Rows of (tournament_id, first_team_id, second_team_id, team_winner_id), with 0 for NULL;
+    # returns the (tournament_id, team_id) keys and their stats in STAT_COLUMNS order
+    tournament, first, second, winner = matches.T
+
+    seated = np.concatenate([first > 0, second > 0])
+    entrants = np.stack([np.tile(tournament, 2), np.concatenate([first, second])], axis=1)
+
+    keys, inverse = np.unique(entrants[seated], axis=0, return_inverse=True)
+    index = np.full(len(entrants), -1)
+    index[seated] = inverse.reshape(-1)
+    first_index, second_index = index[:len(matches)], index[len(matches):]
+
+    contested = (first > 0) & (second > 0) & (winner > 0)
+    bye = (second == 0) & (winner > 0)
+
+    winner_index = np.where(winner == first, first_index, second_index)[contested]
+    loser_index = np.where(winner == first, second_index, first_index)[contested]
+
+    size = len(keys)
+    wins = np.bincount(winner_index, minlength=size)
+    losses = np.bincount(loser_index, minlength=size)
+    byes = np.bincount(first_index[bye], minlength=size)
+    points = wins + byes
+
+    first_contested, second_contested = first_index[contested], second_index[contested]
+    buchholz = (
+        np.bincount(first_contested, weights=points[second_contested], minlength=size)
+        + np.bincount(second_contested, weights=points[first_contested], minlength=size)
+    ).astype(np.int64)
+
+    return keys, np.stack([wins + losses, wins, losses, byes, points, buchholz], axis=1)
+
+
+async def rebuild_standings(session: AsyncSession, tournament_id: int | None = None) -> SStandingsRebuild:
+    scope = [] if tournament_id is None else [BracketORM.tournament_id == tournament_id]
+
+    # Same lock the result pipeline takes first, so no result lands between the read and the rewrite
+    tournament_ids = (await session.execute(
+        select(
+            BracketORM.tournament_id
+        ).where(
+            *scope
+        ).order_by(
+            BracketORM.id
+        ).with_for_update()
+    )).scalars().all()
+
+    matches = np.array((await session.execute(
+        select(
+            BracketORM.tournament_id,
+            func.coalesce(BracketMatchORM.first_team_id, 0),
+            func.coalesce(BracketMatchORM.second_team_id, 0),
+            func.coalesce(MatchORM.team_winner_id, 0)
+        ).join(
+            BracketMatchORM, BracketMatchORM.bracket_id == BracketORM.id
+        ).join(
+            MatchORM, MatchORM.id == BracketMatchORM.match_id
+        ).where(
+            *scope
+        )
+    )).tuples().all(), dtype=np.int64).reshape(-1, 4)
+
+    keys, stats = compute_standings(matches)
+    rebuilt = {tuple(key): dict(zip(STAT_COLUMNS, row)) for key, row in zip(keys.tolist(), stats.tolist())}
+
+    stored = {
+        (standing.tournament_id, standing.team_id): {column: getattr(standing, column) for column in STAT_COLUMNS}
+        for standing in (await session.execute(
+            select(
+                StandingORM
+            ).where(
+                StandingORM.tournament_id.in_(tournament_ids)
+            )
+        )).scalars()
+    }
+
+    mismatches = [
+        SStandingMismatch(
+            tournament_id=key[0],
+            team_id=key[1],
+            stored=None if key not in stored else SStandingStats(**stored[key]),
+            rebuilt=None if key not in rebuilt else SStandingStats(**rebuilt[key])
+        )
+        for key in sorted(stored.keys() | rebuilt.keys())
+        if stored.get(key) != rebuilt.get(key)
+    ]
+
+    if mismatches:
+        await session.execute(
+            delete(
+                StandingORM
+            ).where(
+                StandingORM.tournament_id.in_(tournament_ids)
+            )
+        )
+
+        if rebuilt:
+            await session.execute(
+                insert(StandingORM),
+                [
+                    {"tournament_id": tournament, "team_id": team, **values}
+                    for (tournament, team), values in rebuilt.items()
+                ]
+            )
+
+    return SStandingsRebuild(tournaments=len(tournament_ids), teams=len(rebuilt), mismatches=mismatches)
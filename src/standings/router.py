@@ -0,0 +1,45 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session, get_async_read_session
+from src.auth import auth_manager, Principal
+
+from .models import StandingORM
+from .schemas import SStanding, SStandingsRebuild
+from .rebuild import rebuild_standings
+
+
+router = APIRouter(prefix="/tournament/standings", tags=["Standings"])
+routers = (router, )
+
+
+@router.get("/")
+async def get_standings(
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        tournament_id: Annotated[int, Query()]
+) -> list[SStanding]:
+    return (await session.execute(
+        select(
+            StandingORM
+        ).where(
+            StandingORM.tournament_id == tournament_id
+        ).order_by(
+            StandingORM.points.desc(), StandingORM.buchholz.desc(), StandingORM.wins.desc(), StandingORM.team_id
+        )
+    )).scalars().all()
+
+
+@router.post("/rebuild", description="Recompute standings from all bracket matches and report where the "
+                                     "incrementally maintained rows had drifted")
+async def post_rebuild(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
+        tournament_id: Annotated[int | None, Query()] = None
+) -> SStandingsRebuild:
+    result = await rebuild_standings(session, tournament_id)
+    await session.commit()
+
+    return result
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class SStandingStats(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    played: int
+    wins: int
+    losses: int
+    byes: int
+    points: int
+    buchholz: int
+
+
+class SStanding(SStandingStats):
+    team_id: int
+
+
+class SStandingMismatch(BaseModel):
+    tournament_id: int
+    team_id: int
+    stored: SStandingStats | None
+    rebuilt: SStandingStats | None
+
+
+class SStandingsRebuild(BaseModel):
+    tournaments: int
+    teams: int
+    mismatches: list[SStandingMismatch]
@@ -0,0 +1,116 @@
+from sqlalchemy import Select, insert, select, update, case, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.matches.models import MatchORM
+from src.brackets.models import BracketMatchORM
+
+from .models import StandingORM
+
+
+async def create_standings(session: AsyncSession, tournament_id: int, team_ids: list[int]):
+    await session.execute(
+        insert(StandingORM),
+        [{"tournament_id": tournament_id, "team_id": team_id} for team_id in team_ids]
+    )
+
+
+def opponents_of(bracket_id: int, team_id: int, exclude_match_id: int) -> Select:
+    # One row per decided meeting, so an opponent met twice in double elimination is counted twice
+    return select(
+        case(
+            (BracketMatchORM.first_team_id == team_id, BracketMatchORM.second_team_id),
+            else_=BracketMatchORM.first_team_id
+        ).label("team_id"),
+        func.count().label("meetings")
+    ).join(
+        MatchORM, MatchORM.id == BracketMatchORM.match_id
+    ).where(
+        BracketMatchORM.bracket_id == bracket_id,
+        BracketMatchORM.match_id != exclude_match_id,
+        or_(BracketMatchORM.first_team_id == team_id, BracketMatchORM.second_team_id == team_id),
+        BracketMatchORM.second_team_id.is_not(None),
+        MatchORM.team_winner_id.is_not(None)
+    ).group_by(
+        "team_id"
+    )
+
+
+async def credit_point(session: AsyncSession, tournament_id: int, bracket_id: int, match_id: int, team_id: int,
+                       **values):
+    await session.execute(
+        update(
+            StandingORM
+        ).where(
+            StandingORM.tournament_id == tournament_id,
+            StandingORM.team_id == team_id
+        ).values(
+            points=StandingORM.points + 1,
+            **values
+        )
+    )
+
+    # The point also raises the Buchholz of everyone the team has met before
+    opponents = opponents_of(bracket_id, team_id, match_id).subquery()
+
+    await session.execute(
+        update(
+            StandingORM
+        ).where(
+            StandingORM.tournament_id == tournament_id,
+            StandingORM.team_id == opponents.c.team_id
+        ).values(
+            buchholz=StandingORM.buchholz + opponents.c.meetings
+        )
+    )
+
+
+async def record_bye(session: AsyncSession, tournament_id: int, bracket_id: int, match_id: int, team_id: int):
+    await credit_point(session, tournament_id, bracket_id, match_id, team_id, byes=StandingORM.byes + 1)
+
+
+async def record_result(session: AsyncSession, tournament_id: int, bracket_match: BracketMatchORM,
+                        winner_id: int | None):
+    # Called once per decided match, finished or cancelled with a walkover winner
+    if winner_id is None or bracket_match.second_team_id is None:
+        return
+
+    loser_id = bracket_match.second_team_id if winner_id == bracket_match.first_team_id \
+        else bracket_match.first_team_id
+
+    await credit_point(
+        session, tournament_id, bracket_match.bracket_id, bracket_match.match_id, winner_id,
+        played=StandingORM.played + 1, wins=StandingORM.wins + 1
+    )
+
+    await session.execute(
+        update(
+            StandingORM
+        ).where(
+            StandingORM.tournament_id == tournament_id,
+            StandingORM.team_id == loser_id
+        ).values(
+            played=StandingORM.played + 1,
+            losses=StandingORM.losses + 1
+        )
+    )
+
+    # The new meeting adds each side's points, including this result, to the other's Buchholz
+    opponent = aliased(StandingORM)
+
+    for team_id, opponent_id in ((winner_id, loser_id), (loser_id, winner_id)):
+        await session.execute(
+            update(
+                StandingORM
+            ).where(
+                StandingORM.tournament_id == tournament_id,
+                StandingORM.team_id == team_id
+            ).values(
+                buchholz=StandingORM.buchholz + select(
+                    opponent.points
+                ).where(
+                    opponent.tournament_id == tournament_id,
+                    opponent.team_id == opponent_id
+                ).scalar_subquery()
+            )
+        )
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import selectinload, joinedload
+
+from .models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+
+
+def team_loader_options() -> list:
+    return [
+        selectinload(
+            TeamORM.members
+        ).joinedload(
+            TeamMemberORM.user
+        ),
+        selectinload(
+            TeamORM.join_requests
+        ).joinedload(
+            TeamJoinRequestORM.user
+        )
+    ]
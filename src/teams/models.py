@@ -1,4 +1,6 @@
-from sqlalchemy import String, Integer, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import String, Integer, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.users.models import UserORM
@@ -13,6 +15,7 @@ class TeamORM(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column((String(length=48)))
     avatar_url: Mapped[str] = mapped_column((String(length=256)), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
     members: Mapped[list["TeamMemberORM"]] = relationship()
     join_requests: Mapped[list["TeamJoinRequestORM"]] = relationship()
@@ -51,3 +54,9 @@ class TeamJoinRequestORM(Base):
     type: Mapped[ETeamJoinRequestType] = mapped_column(Integer)
     user: Mapped[UserORM] = relationship()
     team: Mapped[TeamORM] = relationship(viewonly=True)
+
+
+Index("ix_Team_name_lower", func.lower(TeamORM.name))
+Index("ix_Team_name_trgm", TeamORM.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("ix_TeamMember_member_id", TeamMemberORM.member_id)
+Index("ix_TeamJoinRequest_user_id_type", TeamJoinRequestORM.user_id, TeamJoinRequestORM.type)
@@ -1,16 +1,20 @@
 from typing import Optional, Annotated, Sequence
-from random import randint
 
 from fastapi import APIRouter, Depends, Body, Response, HTTPException, status
-from sqlalchemy import select, insert, delete
+from sqlalchemy import Select, select, insert, update, delete, func
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_async_session
-from src.auth import auth_manager
+from src.database import get_async_session, get_async_read_session, touch
+from src.pagination import SPage, Pagination, like_prefix
+from src.response_cache import response_cache
+from src.conditional import Version, conditional
+from src.auth import auth_manager, Principal
 from src.users.models import UserORM
+from src.avatars.identicon import avatar_url
 
 from .models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+from .loaders import team_loader_options
 from .schemas import STeam, STeamAdd, STeamMember, FTeamID, STeamRequest, STeamInvitation
 from .enums import ETeamMemberRole, ETeamJoinRequestType
 
@@ -23,15 +27,71 @@ join_router = APIRouter(prefix="/team/join", tags=["Teams"])
 routers = (team_router, member_router, join_router, teams_router)
 
 
+def team_tags(team: TeamORM | None) -> list[str]:
+    # A cached miss must go once the team is created
+    return ["teams"] if team is None else [f"team:{team.id}"]
+
+
+def teams_page_tags(page: dict) -> list[str]:
+    return ["teams", *(f"team:{team.id}" for team in page["items"])]
+
+
+def filter_teams(query: Select, name: str | None) -> Select:
+    if name is not None:
+        query = query.where(TeamORM.name.ilike(like_prefix(name)))
+
+    return query
+
+
+async def team_version(
+        session: AsyncSession,
+        id: int | None = None, name: str | None = None
+) -> Version | None:
+    if id is not None:
+        params = TeamORM.id == id
+    elif name is not None:
+        params = func.lower(TeamORM.name) == name.lower()
+    else:
+        return None
+
+    updated_at = (await session.execute(
+        select(
+            TeamORM.updated_at
+        ).where(
+            params
+        )
+    )).scalar_one_or_none()
+
+    return None if updated_at is None else Version(updated_at)
+
+
+async def teams_version(session: AsyncSession, pagination: Pagination, name: str | None = None) -> Version:
+    page = pagination.apply(
+        filter_teams(select(TeamORM.id, TeamORM.updated_at), name), TeamORM.id
+    ).subquery()
+
+    updated_at, count, ids = (await session.execute(
+        select(
+            func.max(page.c.updated_at), func.count(), func.array_agg(page.c.id)
+        ).select_from(
+            page
+        )
+    )).one()
+
+    return Version(updated_at, count, tuple(sorted(ids or ())))
+
+
 @team_router.get("/", response_model=Optional[STeam])
+@conditional(team_version)
+@response_cache.cached("team", Optional[STeam], team_tags)
 async def get_team(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
         id: int | None = None, name: str | None = None
 ):
     if id is not None:
         params = TeamORM.id == id
     elif name is not None:
-        params = TeamORM.name.ilike(name)
+        params = func.lower(TeamORM.name) == name.lower()
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,20 +102,11 @@ async def get_team(
         select(
             TeamORM
         ).options(
-            joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            ),
-            joinedload(
-                TeamORM.join_requests
-            ).joinedload(
-                TeamJoinRequestORM.user
-            )
+            *team_loader_options()
         ).where(
             params
         )
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if team is None:
         return None
@@ -66,10 +117,10 @@ async def get_team(
 @team_router.post("/", response_model=STeam)
 async def post_team(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team: STeamAdd
 ):
-    query = select(TeamORM).where(TeamORM.name.ilike(team.name))
+    query = select(TeamORM).where(func.lower(TeamORM.name) == team.name.lower())
 
     if (await session.execute(query)).first() is not None:
         raise HTTPException(
@@ -78,7 +129,6 @@ async def post_team(
         )
 
     data = team.dict(include=set(TeamORM.__dict__.keys()))
-    data["avatar_url"] = f"https://picsum.photos/{randint(64, 512)}/{randint(64, 512)}"
 
     created_team_id = (await session.execute(
         insert(
@@ -88,6 +138,16 @@ async def post_team(
         ).returning(TeamORM.id)
     )).scalar_one()
 
+    await session.execute(
+        update(
+            TeamORM
+        ).where(
+            TeamORM.id == created_team_id
+        ).values(
+            avatar_url=avatar_url("team", created_team_id)
+        )
+    )
+
     # TODO: Add members from team.members_ids
 
     await session.execute(
@@ -99,14 +159,23 @@ async def post_team(
     )
 
     await session.commit()
+    await response_cache.invalidate("teams")
 
-    return await get_team(session, created_team_id)
+    return (await session.execute(
+        select(
+            TeamORM
+        ).options(
+            *team_loader_options()
+        ).where(
+            TeamORM.id == created_team_id
+        )
+    )).scalar_one()
 
 
 @join_router.post("/invite", description="Send an invitation to the team")
 async def post_join_invite(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: Annotated[int, Body()], user_id: Annotated[int, Body()]
 ):
     team = (await session.execute(
@@ -194,7 +263,9 @@ async def post_join_invite(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -202,7 +273,7 @@ async def post_join_invite(
 @join_router.patch("/invite", description="Accept an invitation to the team")
 async def patch_join_invite(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: FTeamID
 ):
     team_id = team_id.team_id
@@ -255,7 +326,9 @@ async def patch_join_invite(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -263,7 +336,7 @@ async def patch_join_invite(
 @join_router.delete("/invite", description="Delete an invitation to the team")
 async def delete_join_invite(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: Annotated[int, Body()], user_id: Annotated[int | None, Body()] = None
 ):
     team = (await session.execute(
@@ -320,7 +393,9 @@ async def delete_join_invite(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -328,7 +403,7 @@ async def delete_join_invite(
 @join_router.post("/request", description="Send a request to the team")
 async def post_join_request(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: FTeamID
 ):
     team_id = team_id.team_id
@@ -392,7 +467,9 @@ async def post_join_request(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -400,7 +477,7 @@ async def post_join_request(
 @join_router.patch("/request", description="Patch a request to the team")
 async def patch_join_request(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: Annotated[int, Body()], user_id: Annotated[int, Body()]
 ):
     team = (await session.execute(
@@ -463,7 +540,9 @@ async def patch_join_request(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -471,7 +550,7 @@ async def patch_join_request(
 @join_router.delete("/request", description="Reject a request to the team")
 async def delete_join_request(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)],
         team_id: Annotated[int, Body()], user_id: Annotated[int, Body()]
 ):
     team = (await session.execute(
@@ -525,15 +604,17 @@ async def delete_join_request(
         )
     )
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @join_router.get("/invitations", description="Gen invitations of current user")
 async def get_invitations(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)]
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)]
 ) -> Sequence[STeamInvitation]:
     return (await session.execute(
         select(
@@ -542,28 +623,19 @@ async def get_invitations(
             joinedload(
                 TeamJoinRequestORM.team
             ).options(
-                joinedload(
-                    TeamORM.members
-                ).joinedload(
-                    TeamMemberORM.user
-                ),
-                joinedload(
-                    TeamORM.join_requests
-                ).joinedload(
-                    TeamJoinRequestORM.user
-                )
+                *team_loader_options()
             )
         ).where(
             TeamJoinRequestORM.user_id == current_user.id,
             TeamJoinRequestORM.type == ETeamJoinRequestType.INVITE
         )
-    )).unique().scalars().all()
+    )).scalars().all()
 
 
 @team_router.post("/member", response_model=STeamMember)  # TODO: Тільки власник може додавати адмінів
 async def post_team_member(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         team_id: int, user_id: int, role: int = ETeamMemberRole.MEMBER
 ):
     team = (await session.execute(
@@ -639,7 +711,9 @@ async def post_team_member(
         )
     )).scalar_one()
 
+    await touch(session, TeamORM, team_id)
     await session.commit()
+    await response_cache.invalidate(f"team:{team_id}")
 
     return STeamMember(
         user=user,
@@ -647,34 +721,31 @@ async def post_team_member(
     )
 
 
-@teams_router.get("/", response_model=list[STeam])  # TODO: Зробить нормально; маладец, зробив; маладец, зробив х2
+@teams_router.get("/", response_model=SPage[STeam])  # TODO: Зробить нормально; маладец, зробив; маладец, зробив х2
+@conditional(teams_version)
+@response_cache.cached("teams", SPage[STeam], teams_page_tags)
 async def get_teams(
-        session: Annotated[AsyncSession, Depends(get_async_session)]
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        pagination: Annotated[Pagination, Depends()],
+        name: str | None = None
 ):
-    members = (await session.execute(
-        select(
-            TeamORM
-        ).options(
-            joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            ),
-            joinedload(
-                TeamORM.join_requests
-            ).joinedload(
-                TeamJoinRequestORM.user
-            )
-        )
-    )).unique().scalars().all()
+    query = filter_teams(select(
+        TeamORM
+    ).options(
+        *team_loader_options()
+    ), name)
 
-    return members
+    teams = (await session.execute(
+        pagination.apply(query, TeamORM.id)
+    )).scalars().all()
+
+    return pagination.page(teams, TeamORM.id)
 
 
 @teams_router.get("/my")
 async def get_my_teams(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
-        current_user: Annotated[UserORM, Depends(auth_manager.current_user)]
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        current_user: Annotated[Principal, Depends(auth_manager.current_principal)]
 ) -> Sequence[STeam]:
     return (await session.execute(
         select(
@@ -685,15 +756,6 @@ async def get_my_teams(
             TeamMemberORM.member_id == current_user.id,
             TeamMemberORM.role == ETeamMemberRole.OWNER
         ).options(
-            joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            ),
-            joinedload(
-                TeamORM.join_requests
-            ).joinedload(
-                TeamJoinRequestORM.user
-            )
+            *team_loader_options()
         )
-    )).unique().scalars().all()
+    )).scalars().all()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from src.avatars.identicon import avatar_url
 
 from src.users.schemas import SUser
 
@@ -31,6 +33,13 @@ class STeam(BaseModel):
     members: list[STeamMember] = []
     join_requests: list[STeamRequest] = []
 
+    @model_validator(mode="after")
+    def default_avatar(self):
+        if self.avatar_url is None:
+            self.avatar_url = avatar_url("team", self.id)
+
+        return self
+
 
 class STeamInvitation(BaseModel):
     team: STeam
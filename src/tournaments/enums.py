@@ -12,3 +12,9 @@ class ETournamentMemberStatus(IntEnum):
     PENDING = 0
     ACCEPTED = 1
     REJECTED = 2
+
+
+class ETournamentPosterStatus(IntEnum):
+    PENDING = 0
+    READY = 1
+    FAILED = 2
@@ -0,0 +1,20 @@
+from sqlalchemy.orm import selectinload, joinedload
+
+from src.teams.loaders import team_loader_options
+
+from .models import TournamentORM, TournamentMemberORM
+
+
+def tournament_loader_options() -> list:
+    return [
+        joinedload(
+            TournamentORM.game
+        ),
+        selectinload(
+            TournamentORM.members
+        ).joinedload(
+            TournamentMemberORM.team
+        ).options(
+            *team_loader_options()
+        )
+    ]
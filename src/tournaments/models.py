@@ -1,10 +1,12 @@
-from sqlalchemy import String, Integer, ForeignKey, URL
+from datetime import datetime
+
+from sqlalchemy import String, Integer, ForeignKey, Index, JSON, func, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.teams.models import TeamORM
 from src.database import Base
 
-from .enums import ETournamentStatus, ETournamentMemberStatus
+from .enums import ETournamentStatus, ETournamentMemberStatus, ETournamentPosterStatus
 
 
 class GameORM(Base):
@@ -22,9 +24,12 @@ class TournamentORM(Base):
     name: Mapped[str] = mapped_column((String(length=128)))
     description: Mapped[str] = mapped_column((String(length=512)), nullable=True)
     poster_url: Mapped[str] = mapped_column(String(length=256), nullable=True)
+    poster_variants: Mapped[dict[str, str]] = mapped_column(JSON, nullable=True)
+    poster_status: Mapped[ETournamentPosterStatus] = mapped_column(Integer, default=ETournamentPosterStatus.READY)
     status: Mapped[ETournamentStatus] = mapped_column(Integer, default=ETournamentStatus.PENDING)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
-    game_id: Mapped[str] = mapped_column(
+    game_id: Mapped[int] = mapped_column(
         ForeignKey(GameORM.__tablename__ + ".id", ondelete="restrict")
     )
 
@@ -40,14 +45,21 @@ class TournamentMemberORM(Base):
         primary_key=True
     )
 
-    team_id: Mapped[TeamORM] = mapped_column(
+    team_id: Mapped[int] = mapped_column(
         ForeignKey(TeamORM.__tablename__ + ".id", ondelete="cascade"),
         primary_key=True
     )
 
     status: Mapped[ETournamentMemberStatus] = mapped_column(Integer, default=ETournamentMemberStatus.PENDING)
+    # 1 is the top seed; a locked seed was set by hand and is kept when the others are recomputed
+    seed: Mapped[int] = mapped_column(nullable=True)
+    seed_locked: Mapped[bool] = mapped_column(default=False, server_default=false())
 
     team: Mapped[TeamORM] = relationship()
 
 
-
+Index("ix_Game_name_lower", func.lower(GameORM.name))
+Index("ix_Game_short_name_lower", func.lower(GameORM.short_name))
+Index("ix_Tournament_game_id", TournamentORM.game_id)
+Index("ix_Tournament_status", TournamentORM.status)
+Index("ix_TournamentMember_team_id", TournamentMemberORM.team_id)
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.outbox.worker import OutboxHandler, outbox_worker
+from src.uploads.storage import upload_staged_image
+from src.uploads.streaming import remove_staging_dir
+from src.response_cache import response_cache
+
+from .models import TournamentORM
+from .enums import ETournamentPosterStatus
+
+
+POSTER_UPLOAD = "tournament_poster_upload"
+
+
+async def upload_poster(session: AsyncSession, payload: dict):
+    poster_url, poster_variants = await upload_staged_image(session, payload)
+
+    await session.execute(
+        update(
+            TournamentORM
+        ).where(
+            TournamentORM.id == payload["tournament_id"]
+        ).values(
+            poster_url=poster_url,
+            poster_variants=poster_variants,
+            poster_status=ETournamentPosterStatus.READY
+        )
+    )
+
+
+async def fail_poster(session: AsyncSession, payload: dict):
+    await session.execute(
+        update(
+            TournamentORM
+        ).where(
+            TournamentORM.id == payload["tournament_id"]
+        ).values(
+            poster_status=ETournamentPosterStatus.FAILED
+        )
+    )
+
+
+async def finalize_poster(payload: dict):
+    # Runs after the worker's commit, so a concurrent read cannot re-cache the old row
+    await response_cache.invalidate(f"tournament:{payload['tournament_id']}")
+    await remove_staging_dir(Path(payload["directory"]))
+
+
+outbox_worker.register(POSTER_UPLOAD, OutboxHandler(
+    handle=upload_poster,
+    on_failure=fail_poster,
+    finalize=finalize_poster
+))
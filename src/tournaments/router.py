@@ -1,24 +1,30 @@
-from io import BytesIO
-from time import time
-from typing import Annotated, Sequence
+from typing import Annotated
 
 from fastapi import (APIRouter, Depends, Body, Query, Form, UploadFile,
                      File, Response, HTTPException, status as http_status)
-from sqlalchemy import insert, select, update
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Select, insert, select, update, func, distinct
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from PIL import Image, UnidentifiedImageError
 
-from src.database import get_async_session
-from src.auth import auth_manager
-from src.users.models import UserORM
-from src.teams.models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+from src.database import get_async_session, get_async_read_session, touch
+from src.pagination import SPage, Pagination
+from src.response_cache import response_cache
+from src.conditional import Version, conditional, latest
+from src.auth import auth_manager, Principal
+from src.teams.models import TeamORM
 from src.teams.enums import ETeamMemberRole
-from src.s3client import s3_client as s3client
+from src.config import POSTER_MAX_SIZE
+from src.images import image_processor, ImageValidationError
+from src.uploads.streaming import upload_workspace, spool_upload, create_staging_dir, remove_staging_dir
+from src.uploads.storage import get_stored_image, staged_image_payload
+from src.outbox.worker import outbox_worker, enqueue
 
 from .models import TournamentORM, TournamentMemberORM, GameORM
-from .schemas import STournament, SGame, SGameAdd, SGameEdit, STournamentAdd
-from .enums import ETournamentStatus, ETournamentMemberStatus
+from .loaders import tournament_loader_options
+from .schemas import STournament, SGame, SGameAdd, SGameEdit, STournamentAdd, STournamentSeed
+from .enums import ETournamentStatus, ETournamentMemberStatus, ETournamentPosterStatus
+from .outbox import POSTER_UPLOAD
+from .seeding import seed_tournament
 
 
 tournament_router = APIRouter(prefix="/tournament", tags=["Tournament"])
@@ -30,37 +36,105 @@ games_router = APIRouter(prefix=tournament_router.prefix + "/games", tags=["Tour
 routers = (tournament_router, tournaments_router, game_router, games_router)
 
 
+def tournament_tags(tournament: TournamentORM | None) -> list[str]:
+    if tournament is None:
+        return ["tournaments"]
+
+    # Member teams are embedded in the response, so their changes invalidate it too
+    return [f"tournament:{tournament.id}", *(f"team:{member.team.id}" for member in tournament.members)]
+
+
+def tournaments_page_tags(page: dict) -> list[str]:
+    return ["tournaments", *(tag for tournament in page["items"] for tag in tournament_tags(tournament))]
+
+
+def games_page_tags(_page: dict) -> list[str]:
+    return ["games"]
+
+
+def filter_tournaments(query: Select, status: ETournamentStatus | None, game_id: int | None) -> Select:
+    if status is not None:
+        query = query.where(TournamentORM.status == status)
+
+    if game_id is not None:
+        query = query.where(TournamentORM.game_id == game_id)
+
+    return query
+
+
+async def tournament_version(session: AsyncSession, id: int) -> Version | None:
+    row = (await session.execute(
+        select(
+            TournamentORM.updated_at, func.max(TeamORM.updated_at), func.count(TeamORM.id)
+        ).outerjoin(
+            TournamentMemberORM, TournamentMemberORM.tournament_id == TournamentORM.id
+        ).outerjoin(
+            TeamORM, TeamORM.id == TournamentMemberORM.team_id
+        ).where(
+            TournamentORM.id == id
+        ).group_by(
+            TournamentORM.id
+        )
+    )).one_or_none()
+
+    if row is None:
+        return None
+
+    tournament_updated_at, teams_updated_at, count = row
+
+    return Version(latest(tournament_updated_at, teams_updated_at), count)
+
+
+async def tournaments_version(
+        session: AsyncSession,
+        pagination: Pagination,
+        status: ETournamentStatus | None = None,
+        game_id: int | None = None
+) -> Version:
+    page = pagination.apply(
+        filter_tournaments(select(TournamentORM.id, TournamentORM.updated_at), status, game_id), TournamentORM.id
+    ).subquery()
+
+    tournaments_updated_at, teams_updated_at, count, ids = (await session.execute(
+        select(
+            func.max(page.c.updated_at),
+            func.max(TeamORM.updated_at),
+            func.count(distinct(page.c.id)),
+            func.array_agg(distinct(page.c.id))
+        ).select_from(
+            page
+        ).outerjoin(
+            TournamentMemberORM, TournamentMemberORM.tournament_id == page.c.id
+        ).outerjoin(
+            TeamORM, TeamORM.id == TournamentMemberORM.team_id
+        )
+    )).one()
+
+    return Version(latest(tournaments_updated_at, teams_updated_at), count, tuple(ids or ()))
+
+
 @tournament_router.get("/")
+@conditional(tournament_version)
+@response_cache.cached("tournament", STournament | None, tournament_tags)
 async def get_tournament(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
         id: Annotated[int, Query()]
 ) -> STournament | None:
     return (await session.execute(
         select(
             TournamentORM
         ).options(
-            joinedload(
-                TournamentORM.game
-            ),
-            joinedload(
-                TournamentORM.members
-            ).joinedload(
-                TournamentMemberORM.team
-            ).joinedload(
-                TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
-            )
+            *tournament_loader_options()
         ).where(
             TournamentORM.id == id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
 
 @tournament_router.post("/")
 async def post_tournament(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         name: Annotated[str, Form(max_length=128)],
         description: Annotated[str, Form(max_length=512)],
         game_id: Annotated[int, Form()],
@@ -72,61 +146,77 @@ async def post_tournament(
         game_id=game_id
     )
 
-    poster = await poster.read()
+    staging = None
 
-    try:
-        image = Image.open(BytesIO(poster))
+    async with upload_workspace() as workspace:
+        size, digest = await spool_upload(poster, workspace / "upload", POSTER_MAX_SIZE)
+        stored = await get_stored_image(session, digest)
+
+        if stored is None:
+            staging = await create_staging_dir()
 
-        if image.format.upper() not in ["PNG", "JPG", "JPEG", "WEBP"]:
-            raise HTTPException(
-                detail="Invalid image format. Allowed: PNG, JPG, JPEG, WEBP",
-                status_code=http_status.HTTP_400_BAD_REQUEST
+            try:
+                image = await image_processor.process(workspace / "upload", staging)
+            except ImageValidationError as e:
+                await remove_staging_dir(staging)
+
+                raise HTTPException(
+                    detail=str(e),
+                    status_code=http_status.HTTP_400_BAD_REQUEST
+                )
+
+    poster_url, poster_variants = stored if stored is not None else (None, None)
+
+    try:
+        response_id = (await session.execute(
+            insert(
+                TournamentORM
+            ).values(
+                name=tournament.name,
+                description=tournament.description,
+                game_id=tournament.game_id,
+                poster_url=poster_url,
+                poster_variants=poster_variants,
+                poster_status=ETournamentPosterStatus.READY if stored is not None else ETournamentPosterStatus.PENDING
+            ).returning(
+                TournamentORM.id
             )
-    except UnidentifiedImageError:
-        raise HTTPException(
-            detail="Invalid image",
-            status_code=http_status.HTTP_400_BAD_REQUEST
-        )
+        )).scalar_one()
 
-    object_name = f"TO_{int(time())}_poster.{image.format.lower()}"
+        # The S3 upload runs in the outbox worker once this transaction has committed
+        if stored is None:
+            await enqueue(session, POSTER_UPLOAD, {
+                **staged_image_payload(image, digest, size),
+                "tournament_id": response_id
+            })
 
-    response_id = (await session.execute(
-        insert(
-            TournamentORM
-        ).values(
-            name=tournament.name,
-            description=tournament.description,
-            game_id=tournament.game_id,
-            poster_url=s3client.gen_url(object_name)
-        ).returning(
-            TournamentORM.id
-        )
-    )).scalar_one()
+        await session.commit()
+    except BaseException:
+        if staging is not None:
+            await remove_staging_dir(staging)
 
-    await s3client.upload_file(poster, object_name)
+        raise
 
-    await session.commit()
+    await response_cache.invalidate("tournaments")
+
+    if stored is None:
+        outbox_worker.notify()
 
     return (await session.execute(
         select(
             TournamentORM
         ).options(
-            joinedload(
-                TournamentORM.game
-            ),
-            joinedload(
-                TournamentORM.members
-            )
+            *tournament_loader_options()
         ).where(
             TournamentORM.id == response_id
         ).limit(1)
-    )).unique().scalar_one()
+    )).scalar_one()
 
 
 @tournament_router.post("/member")
 async def post_tournament_member(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        user: Annotated[UserORM, Depends(auth_manager.current_user)],
+        user: Annotated[Principal, Depends(auth_manager.current_principal)],
         tournament_id: Annotated[int, Body()],
         team_id: Annotated[int, Body()]
 ):
@@ -134,18 +224,13 @@ async def post_tournament_member(
         select(
             TournamentORM
         ).options(
-            joinedload(
-                TournamentORM.game
-            ),
-            joinedload(
+            selectinload(
                 TournamentORM.members
-            ).joinedload(
-                TournamentMemberORM.team
             )
         ).where(
             TournamentORM.id == tournament_id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if tournament is None:
         raise HTTPException(
@@ -163,15 +248,13 @@ async def post_tournament_member(
         select(
             TeamORM
         ).options(
-            joinedload(
+            selectinload(
                 TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
             )
         ).where(
             TeamORM.id == team_id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if team is None:
         raise HTTPException(
@@ -179,7 +262,7 @@ async def post_tournament_member(
             detail=f"Team with ID {team_id} does not exist"
         )
 
-    user_role = {member.user.id: member.role for member in team.members}.get(user.id)
+    user_role = {member.member_id: member.role for member in team.members}.get(user.id)
 
     if user_role is None or not user_role <= ETeamMemberRole.ADMIN:
         raise HTTPException(
@@ -187,7 +270,7 @@ async def post_tournament_member(
             detail="Only the administrator can send requests to participate in tournaments"
         )
 
-    tournament_member_status = {member.team.id: member.status for member in tournament.members}.get(team_id)
+    tournament_member_status = {member.team_id: member.status for member in tournament.members}.get(team_id)
 
     if tournament_member_status == ETournamentMemberStatus.ACCEPTED:
         raise HTTPException(
@@ -210,7 +293,9 @@ async def post_tournament_member(
         )
     )
 
+    await touch(session, TournamentORM, tournament_id)
     await session.commit()
+    await response_cache.invalidate(f"tournament:{tournament_id}")
 
     return Response(status_code=http_status.HTTP_204_NO_CONTENT)
 
@@ -218,7 +303,7 @@ async def post_tournament_member(
 @tournament_router.patch("/member")
 async def patch_tournament_member(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         tournament_id: Annotated[int, Body()],
         team_id: Annotated[int, Body()],
         status: Annotated[ETournamentMemberStatus, Body()],
@@ -227,18 +312,13 @@ async def patch_tournament_member(
         select(
             TournamentORM
         ).options(
-            joinedload(
-                TournamentORM.game
-            ),
-            joinedload(
+            selectinload(
                 TournamentORM.members
-            ).joinedload(
-                TournamentMemberORM.team
             )
         ).where(
             TournamentORM.id == tournament_id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if tournament is None:
         raise HTTPException(
@@ -250,15 +330,13 @@ async def patch_tournament_member(
         select(
             TeamORM
         ).options(
-            joinedload(
+            selectinload(
                 TeamORM.members
-            ).joinedload(
-                TeamMemberORM.user
             )
         ).where(
             TeamORM.id == team_id
         ).limit(1)
-    )).unique().scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if team is None:
         raise HTTPException(
@@ -266,7 +344,7 @@ async def patch_tournament_member(
             detail=f"Team with ID {team_id} does not exist"
         )
 
-    tournament_member_status = {member.team.team_id: member.status for member in tournament.members}.get(team_id)
+    tournament_member_status = {member.team_id: member.status for member in tournament.members}.get(team_id)
 
     if tournament_member_status is None:
         raise HTTPException(
@@ -285,45 +363,137 @@ async def patch_tournament_member(
         )
     )
 
+    await touch(session, TournamentORM, tournament_id)
     await session.commit()
+    await response_cache.invalidate(f"tournament:{tournament_id}")
 
     return Response(status_code=http_status.HTTP_204_NO_CONTENT)
 
 
-@tournaments_router.get("/")
-async def get_tournaments(
-        session: Annotated[AsyncSession, Depends(get_async_session)]
-) -> Sequence[STournament]:
-    return (await session.execute(
+async def get_pending_tournament_for_update(session: AsyncSession, tournament_id: int) -> TournamentORM:
+    tournament = (await session.execute(
         select(
             TournamentORM
-        ).options(
-            joinedload(
-                TournamentORM.game
-            ),
-            joinedload(
-                TournamentORM.members
-            ).joinedload(
-                TournamentMemberORM.team
-            ).options(
-                joinedload(
-                    TeamORM.members
-                ).joinedload(
-                    TeamMemberORM.user
-                ),
-                joinedload(
-                    TeamORM.join_requests
-                ).joinedload(
-                    TeamJoinRequestORM.user
-                )
-            )
+        ).where(
+            TournamentORM.id == tournament_id
+        ).with_for_update()
+    )).scalar_one_or_none()
+
+    if tournament is None:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail=f"Tournament with ID {tournament_id} does not exist"
+        )
+
+    if tournament.status != ETournamentStatus.PENDING:
+        raise HTTPException(
+            status_code=http_status.HTTP_409_CONFLICT,
+            detail=f"Tournament with ID {tournament_id} has already started"
+        )
+
+    return tournament
+
+
+@tournament_router.post("/seeding", description="Recompute the seeds of the accepted members from their ratings "
+                                                "and match history, keeping manually locked seeds")
+async def post_tournament_seeding(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
+        tournament_id: Annotated[int, Query()]
+) -> list[STournamentSeed]:
+    tournament = await get_pending_tournament_for_update(session, tournament_id)
+    seeds = await seed_tournament(session, tournament.id, tournament.game_id)
+
+    await touch(session, TournamentORM, tournament_id)
+    await session.commit()
+    await response_cache.invalidate(f"tournament:{tournament_id}")
+
+    return seeds
+
+
+@tournament_router.patch("/member/seed", description="Set a member's seed by hand, or unlock it with a null seed")
+async def patch_tournament_member_seed(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
+        tournament_id: Annotated[int, Body()],
+        team_id: Annotated[int, Body()],
+        seed: Annotated[int | None, Body(ge=1)]
+) -> list[STournamentSeed]:
+    tournament = await get_pending_tournament_for_update(session, tournament_id)
+
+    members = (await session.execute(
+        select(
+            TournamentMemberORM
+        ).where(
+            TournamentMemberORM.tournament_id == tournament_id,
+            TournamentMemberORM.status == ETournamentMemberStatus.ACCEPTED
+        )
+    )).scalars().all()
+
+    if team_id not in {member.team_id for member in members}:
+        raise HTTPException(
+            status_code=http_status.HTTP_409_CONFLICT,
+            detail=f"Team with ID {team_id} is not an accepted participant in tournament with ID {tournament_id}"
+        )
+
+    if seed is not None and seed > len(members):
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Seed must be between 1 and {len(members)}"
         )
-    )).unique().scalars().all()
+
+    if any(member.seed_locked and member.seed == seed and member.team_id != team_id for member in members):
+        raise HTTPException(
+            status_code=http_status.HTTP_409_CONFLICT,
+            detail=f"Seed {seed} is already locked to another team"
+        )
+
+    await session.execute(
+        update(
+            TournamentMemberORM
+        ).where(
+            TournamentMemberORM.tournament_id == tournament_id,
+            TournamentMemberORM.team_id == team_id
+        ).values(
+            seed=seed,
+            seed_locked=seed is not None
+        )
+    )
+
+    seeds = await seed_tournament(session, tournament.id, tournament.game_id)
+
+    await touch(session, TournamentORM, tournament_id)
+    await session.commit()
+    await response_cache.invalidate(f"tournament:{tournament_id}")
+
+    return seeds
+
+
+@tournaments_router.get("/")
+@conditional(tournaments_version)
+@response_cache.cached("tournaments", SPage[STournament], tournaments_page_tags)
+async def get_tournaments(
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        pagination: Annotated[Pagination, Depends()],
+        status: ETournamentStatus | None = None,
+        game_id: int | None = None
+) -> SPage[STournament]:
+    query = filter_tournaments(select(
+        TournamentORM
+    ).options(
+        *tournament_loader_options()
+    ), status, game_id)
+
+    tournaments = (await session.execute(
+        pagination.apply(query, TournamentORM.id)
+    )).scalars().all()
+
+    return pagination.page(tournaments, TournamentORM.id)
 
 
 @game_router.get("/")
 async def get_game(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
         id: Annotated[int, Query()]
 ) -> SGame | None:
     return (await session.execute(
@@ -338,14 +508,14 @@ async def get_game(
 @game_router.post("/")
 async def post_game(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         game: Annotated[SGameAdd, Body()]
 ) -> SGame:
     name_is_used = (await session.execute(
         select(
             GameORM
         ).where(
-            GameORM.name.ilike(game.name)
+            func.lower(GameORM.name) == game.name.lower()
         ).limit(1)
     )).scalar_one_or_none() is not None
 
@@ -353,7 +523,7 @@ async def post_game(
         select(
             GameORM
         ).where(
-            GameORM.short_name.ilike(game.short_name)
+            func.lower(GameORM.short_name) == game.short_name.lower()
         ).limit(1)
     )).scalar_one_or_none() is not None
 
@@ -380,6 +550,7 @@ async def post_game(
     )).scalar_one()
 
     await session.commit()
+    await response_cache.invalidate("games")
 
     return result
 
@@ -387,19 +558,20 @@ async def post_game(
 @game_router.put("/")
 async def put_game(
         session: Annotated[AsyncSession, Depends(get_async_session)],
-        _: Annotated[UserORM, Depends(auth_manager.current_administrator)],
+        _: Annotated[Principal, Depends(auth_manager.current_administrator_principal)],
         game: Annotated[SGameEdit, Body()]
 ) -> SGame:
     ...
 
 
 @games_router.get("/")
+@response_cache.cached("games", SPage[SGame], games_page_tags)
 async def get_games(
-        session: Annotated[AsyncSession, Depends(get_async_session)],
-
-) -> Sequence[SGame]:
-    return (await session.execute(
-        select(
-            GameORM
-        )
+        session: Annotated[AsyncSession, Depends(get_async_read_session)],
+        pagination: Annotated[Pagination, Depends()]
+) -> SPage[SGame]:
+    games = (await session.execute(
+        pagination.apply(select(GameORM), GameORM.id)
     )).scalars().all()
+
+    return pagination.page(games, GameORM.id)
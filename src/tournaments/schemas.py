@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 
 from src.teams.schemas import STeam
 
-from .enums import ETournamentStatus, ETournamentMemberStatus
+from .enums import ETournamentStatus, ETournamentMemberStatus, ETournamentPosterStatus
 
 
 class SGame(BaseModel):
@@ -25,6 +25,14 @@ class SGameEdit(BaseModel):
 class STournamentMember(BaseModel):
     team: STeam
     status: ETournamentMemberStatus
+    seed: int | None = None
+    seed_locked: bool = False
+
+
+class STournamentSeed(BaseModel):
+    team_id: int
+    seed: int
+    seed_locked: bool
 
 
 class STournament(BaseModel):
@@ -32,6 +40,8 @@ class STournament(BaseModel):
     name: str = Field(max_length=128)
     description: str | None = Field(max_length=512)
     poster_url: str | None = Field(max_length=256)
+    poster_variants: dict[str, str] | None = None
+    poster_status: ETournamentPosterStatus
     status: ETournamentStatus
 
     game: SGame
@@ -0,0 +1,113 @@
+from sqlalchemy import Select, Float, select, update, case, cast, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import RATING_INITIAL
+from src.matches.models import MatchORM, MatchMemberORM
+from src.matches.enums import EMatchStatus
+from src.ratings.models import RatingORM
+
+from .models import TournamentMemberORM
+from .schemas import STournamentSeed
+from .enums import ETournamentMemberStatus
+
+
+def seeding_query(tournament_id: int, game_id: int) -> Select:
+    accepted = select(
+        TournamentMemberORM.team_id
+    ).where(
+        TournamentMemberORM.tournament_id == tournament_id,
+        TournamentMemberORM.status == ETournamentMemberStatus.ACCEPTED
+    )
+
+    # Every finished match the entrants ever played, aggregated in one pass over the team_id index
+    history = select(
+        MatchMemberORM.team_id,
+        func.count().label("played"),
+        func.count(case((MatchORM.team_winner_id == MatchMemberORM.team_id, 1))).label("wins")
+    ).join(
+        MatchORM, MatchORM.id == MatchMemberORM.match_id
+    ).where(
+        MatchMemberORM.team_id.in_(accepted),
+        MatchORM.status == EMatchStatus.finished
+    ).group_by(
+        MatchMemberORM.team_id
+    ).subquery()
+
+    # The rating for the tournament's game comes first, unrated teams start from the initial rating;
+    # ties are broken by the overall win rate, smoothed so a team without history sits at one half
+    return select(
+        TournamentMemberORM.team_id, TournamentMemberORM.seed, TournamentMemberORM.seed_locked
+    ).outerjoin(
+        RatingORM, and_(RatingORM.team_id == TournamentMemberORM.team_id, RatingORM.game_id == game_id)
+    ).outerjoin(
+        history, history.c.team_id == TournamentMemberORM.team_id
+    ).where(
+        TournamentMemberORM.tournament_id == tournament_id,
+        TournamentMemberORM.status == ETournamentMemberStatus.ACCEPTED
+    ).order_by(
+        func.coalesce(RatingORM.rating, RATING_INITIAL).desc(),
+        (
+            (func.coalesce(history.c.wins, 0) + 1) / cast(func.coalesce(history.c.played, 0) + 2, Float)
+        ).desc(),
+        func.coalesce(history.c.played, 0).desc(),
+        TournamentMemberORM.team_id
+    )
+
+
+def assign_seeds(ranked: list[tuple[int, int | None, bool]]) -> list[STournamentSeed]:
+    # Locked seeds keep their number and their lock. Ones left out of range after the field shrank are clamped to the
+    # closest free seeds below, keeping their order; everyone else fills the remaining numbers in ranked order
+    count = len(ranked)
+    taken = {}
+
+    locks = sorted((seed, team_id) for team_id, seed, seed_locked in ranked if seed_locked and seed is not None)
+    clamped = []
+
+    for seed, team_id in locks:
+        if seed <= count and seed not in taken:
+            taken[seed] = team_id
+        else:
+            clamped.append((seed, team_id))
+
+    for seed, team_id in reversed(clamped):
+        free = [number for number in range(1, count + 1) if number not in taken]
+        taken[max((number for number in free if number <= seed), default=free[0])] = team_id
+
+    free = iter(seed for seed in range(1, count + 1) if seed not in taken)
+    locked = set(taken.values())
+
+    seeds = [
+        STournamentSeed(team_id=team_id, seed=next(free), seed_locked=False)
+        for team_id, _, _ in ranked if team_id not in locked
+    ]
+    seeds.extend(STournamentSeed(team_id=team_id, seed=seed, seed_locked=True) for seed, team_id in taken.items())
+
+    return sorted(seeds, key=lambda seed: seed.seed)
+
+
+async def seed_tournament(session: AsyncSession, tournament_id: int, game_id: int) -> list[STournamentSeed]:
+    seeds = assign_seeds(list((await session.execute(seeding_query(tournament_id, game_id))).tuples().all()))
+
+    await session.execute(
+        update(
+            TournamentMemberORM
+        ).where(
+            TournamentMemberORM.tournament_id == tournament_id,
+            TournamentMemberORM.status != ETournamentMemberStatus.ACCEPTED
+        ).values(
+            seed=None,
+            seed_locked=False
+        )
+    )
+
+    if seeds:
+        await session.execute(
+            update(TournamentMemberORM),
+            [
+                {"tournament_id": tournament_id, "team_id": seed.team_id, "seed": seed.seed,
+                 "seed_locked": seed.seed_locked}
+                for seed in seeds
+            ]
+        )
+
+    return seeds
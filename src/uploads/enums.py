@@ -0,0 +1,7 @@
+from enum import IntEnum
+
+
+class EUploadTarget(IntEnum):
+    TOURNAMENT = 0
+    TEAM = 1
+    USER = 2
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import String, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class StoredObjectORM(Base):
+    __tablename__ = "StoredObject"
+
+    hash: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+    object_name: Mapped[str] = mapped_column(String(length=256))
+    content_type: Mapped[str] = mapped_column(String(length=64))
+    size: Mapped[int] = mapped_column()
+    variants: Mapped[dict[str, str]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
@@ -0,0 +1,214 @@
+import re
+from typing import Annotated
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_session, async_session_maker
+from src.auth import auth_manager, Principal
+from src.config import POSTER_MAX_SIZE, AVATAR_MAX_SIZE, PRESIGNED_UPLOAD_EXPIRES
+from src.s3client import s3_client
+from src.response_cache import response_cache
+from src.images import image_processor, upload_image, ImageValidationError
+from src.users.models import UserORM
+from src.teams.models import TeamORM, TeamMemberORM
+from src.teams.enums import ETeamMemberRole
+from src.tournaments.models import TournamentORM
+
+from .streaming import upload_workspace
+from .schemas import SUploadPresign, SPresignedUpload, SUploadConfirm, SUploadConfirmed
+from .enums import EUploadTarget
+
+
+router = APIRouter(prefix="/upload", tags=["Uploads"])
+routers = (router, )
+
+EXTENSIONS = {"image/png": "png", "image/jpeg": "jpeg", "image/webp": "webp"}
+
+TARGETS = {
+    EUploadTarget.TOURNAMENT: (TournamentORM, TournamentORM.poster_url, POSTER_MAX_SIZE),
+    EUploadTarget.TEAM: (TeamORM, TeamORM.avatar_url, AVATAR_MAX_SIZE),
+    EUploadTarget.USER: (UserORM, UserORM.avatar_url, AVATAR_MAX_SIZE)
+}
+
+
+def target_tag(target: EUploadTarget, target_id: int) -> str:
+    return f"{target.name.lower()}:{target_id}"
+
+
+def key_prefix(target: EUploadTarget, target_id: int) -> str:
+    return f"UP/{target.name}/{target_id}/"
+
+
+async def authorize_target(session: AsyncSession, principal: Principal, target: EUploadTarget, target_id: int):
+    forbidden_exc = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="You cannot upload files for this object"
+    )
+
+    if target == EUploadTarget.USER:
+        if target_id != principal.id:
+            raise forbidden_exc
+
+        return
+
+    model, _, _ = TARGETS[target]
+
+    if (await session.execute(select(model.id).where(model.id == target_id))).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Object not found"
+        )
+
+    if principal.is_admin:
+        return
+
+    if target == EUploadTarget.TEAM:
+        role = (await session.execute(
+            select(
+                TeamMemberORM.role
+            ).where(
+                TeamMemberORM.team_id == target_id,
+                TeamMemberORM.member_id == principal.id
+            )
+        )).scalar_one_or_none()
+
+        if role is not None and role <= ETeamMemberRole.ADMIN:
+            return
+
+    raise forbidden_exc
+
+
+async def validate_upload(target: EUploadTarget, target_id: int, key: str, url: str):
+    model, column, _ = TARGETS[target]
+    stem, extension = key.rsplit(".", 1)
+    values = {}
+
+    try:
+        async with upload_workspace() as workspace:
+            await s3_client.download_path(key, workspace / "upload")
+            image = await image_processor.process(workspace / "upload", workspace)
+
+            if image.extension != extension:
+                raise ImageValidationError("Image format does not match the declared content type")
+
+            # The stripped re-encode replaces the client's bytes under the same key
+            if target == EUploadTarget.TOURNAMENT:
+                _, values["poster_variants"] = await upload_image(image, stem)
+            else:
+                await s3_client.upload_path(image.path, key, image.content_type)
+    except ImageValidationError:
+        await s3_client.delete_file(key)
+
+        values = {column.key: None}
+
+        if target == EUploadTarget.TOURNAMENT:
+            values["poster_variants"] = None
+
+    if not values:
+        return
+
+    async with async_session_maker() as session:
+        # Skipped if another upload has been attached in the meantime
+        await session.execute(
+            update(
+                model
+            ).where(
+                model.id == target_id, column == url
+            ).values(
+                values
+            )
+        )
+
+        await session.commit()
+
+    await response_cache.invalidate(target_tag(target, target_id))
+
+
+@router.post("/presign", description="Issue a presigned POST for a direct upload to S3")
+async def post_upload_presign(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        principal: Annotated[Principal, Depends(auth_manager.current_principal)],
+        upload: SUploadPresign
+) -> SPresignedUpload:
+    _, _, max_size = TARGETS[upload.target]
+
+    if upload.size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is too large. Maximum: {max_size} bytes"
+        )
+
+    await authorize_target(session, principal, upload.target, upload.target_id)
+
+    key = f"{key_prefix(upload.target, upload.target_id)}{uuid4().hex}.{EXTENSIONS[upload.content_type]}"
+    presigned = await s3_client.generate_presigned_post(
+        key, upload.content_type, upload.size, PRESIGNED_UPLOAD_EXPIRES
+    )
+
+    return SPresignedUpload(
+        key=key,
+        url=presigned["url"],
+        fields=presigned["fields"],
+        expires_in=PRESIGNED_UPLOAD_EXPIRES
+    )
+
+
+@router.post("/confirm", description="Attach a finished direct upload; the image is validated in the background")
+async def post_upload_confirm(
+        session: Annotated[AsyncSession, Depends(get_async_session)],
+        principal: Annotated[Principal, Depends(auth_manager.current_principal)],
+        background_tasks: BackgroundTasks,
+        upload: SUploadConfirm
+) -> SUploadConfirmed:
+    model, column, max_size = TARGETS[upload.target]
+    key_pattern = re.escape(key_prefix(upload.target, upload.target_id)) + r"[0-9a-f]{32}\.(png|jpeg|webp)"
+
+    if re.fullmatch(key_pattern, upload.key) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload key"
+        )
+
+    await authorize_target(session, principal, upload.target, upload.target_id)
+
+    head = await s3_client.head_file(upload.key)
+
+    if head is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+
+    if head["ContentLength"] > max_size or EXTENSIONS.get(head.get("ContentType")) != upload.key.rsplit(".", 1)[1]:
+        await s3_client.delete_file(upload.key)
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file does not match the presigned constraints"
+        )
+
+    url = s3_client.gen_url(upload.key)
+    values = {column.key: url}
+
+    if upload.target == EUploadTarget.TOURNAMENT:
+        values["poster_variants"] = None
+
+    await session.execute(
+        update(
+            model
+        ).where(
+            model.id == upload.target_id
+        ).values(
+            values
+        )
+    )
+
+    await session.commit()
+    await response_cache.invalidate(target_tag(upload.target, upload.target_id))
+
+    background_tasks.add_task(validate_upload, upload.target, upload.target_id, upload.key, url)
+
+    return SUploadConfirmed(url=url)
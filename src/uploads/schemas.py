@@ -0,0 +1,29 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .enums import EUploadTarget
+
+
+class SUploadPresign(BaseModel):
+    target: EUploadTarget
+    target_id: int
+    content_type: Literal["image/png", "image/jpeg", "image/webp"]
+    size: int = Field(gt=0)
+
+
+class SPresignedUpload(BaseModel):
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+class SUploadConfirm(BaseModel):
+    target: EUploadTarget
+    target_id: int
+    key: str = Field(max_length=256)
+
+
+class SUploadConfirmed(BaseModel):
+    url: str
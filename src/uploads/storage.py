@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.s3client import s3_client
+from src.images import ProcessedImage, CONTENT_TYPES, VARIANT_FORMAT, variant_object_name
+
+from .models import StoredObjectORM
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_object_stem(digest: str) -> str:
+    return f"IMG/{digest}"
+
+
+def stored_urls(stored: StoredObjectORM) -> tuple[str, dict[str, str]]:
+    return s3_client.gen_url(stored.object_name), {
+        variant: s3_client.gen_url(name) for variant, name in (stored.variants or {}).items()
+    }
+
+
+async def get_stored_image(session: AsyncSession, digest: str) -> tuple[str, dict[str, str]] | None:
+    stored = (await session.execute(
+        select(
+            StoredObjectORM
+        ).where(
+            StoredObjectORM.hash == digest
+        )
+    )).scalar_one_or_none()
+
+    return None if stored is None else stored_urls(stored)
+
+
+def staged_image_payload(image: ProcessedImage, digest: str, size: int) -> dict:
+    stem = content_object_stem(digest)
+    object_name = f"{stem}.{image.extension}"
+    variants = {variant: variant_object_name(stem, variant) for variant in image.variants}
+
+    return {
+        "hash": digest,
+        "size": size,
+        "directory": str(image.path.parent),
+        "object_name": object_name,
+        "variants": variants,
+        "files": [
+            [object_name, image.path.name, image.content_type],
+            *(
+                [variants[variant], path.name, CONTENT_TYPES[VARIANT_FORMAT]]
+                for variant, path in image.variants.items()
+            )
+        ]
+    }
+
+
+async def upload_staged_image(session: AsyncSession, payload: dict) -> tuple[str, dict[str, str]]:
+    directory = Path(payload["directory"])
+
+    # Keys are content-addressed, so a retry after a partial failure simply overwrites identical objects
+    await asyncio.gather(*(
+        s3_client.upload_path(directory / filename, object_name, content_type, IMMUTABLE_CACHE_CONTROL)
+        for object_name, filename, content_type in payload["files"]
+    ))
+
+    stored = StoredObjectORM(
+        hash=payload["hash"],
+        object_name=payload["object_name"],
+        content_type=payload["files"][0][2],
+        size=payload["size"],
+        variants=payload["variants"]
+    )
+
+    await session.execute(
+        insert(
+            StoredObjectORM
+        ).values(
+            hash=stored.hash,
+            object_name=stored.object_name,
+            content_type=stored.content_type,
+            size=stored.size,
+            variants=stored.variants
+        ).on_conflict_do_nothing(
+            index_elements=[StoredObjectORM.hash]
+        )
+    )
+
+    return stored_urls(stored)
@@ -0,0 +1,67 @@
+import hashlib
+import shutil
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import mkdtemp, gettempdir
+from typing import AsyncIterator
+
+from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from src.config import UPLOAD_SPOOL_DIR, UPLOAD_CHUNK_SIZE, UPLOAD_STAGING_DIR
+
+
+STAGING_DIR = Path(UPLOAD_STAGING_DIR) if UPLOAD_STAGING_DIR else Path(gettempdir()) / "upload_staging"
+
+
+@asynccontextmanager
+async def upload_workspace() -> AsyncIterator[Path]:
+    path = Path(await run_in_threadpool(mkdtemp, prefix="upload_", dir=UPLOAD_SPOOL_DIR))
+
+    try:
+        yield path
+    finally:
+        await run_in_threadpool(shutil.rmtree, path, True)
+
+
+async def create_staging_dir() -> Path:
+    # Unlike a workspace, a staging directory outlives the request and is removed by whoever consumes it
+    def create() -> str:
+        STAGING_DIR.mkdir(parents=True, exist_ok=True)
+
+        return mkdtemp(prefix="staged_", dir=STAGING_DIR)
+
+    return Path(await run_in_threadpool(create))
+
+
+async def remove_staging_dir(path: Path):
+    await run_in_threadpool(shutil.rmtree, path, True)
+
+
+async def spool_upload(file: UploadFile, path: Path, max_size: int,
+                       chunk_size: int = UPLOAD_CHUNK_SIZE) -> tuple[int, str]:
+    too_large_exc = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is too large. Maximum: {max_size} bytes"
+    )
+
+    if file.size is not None and file.size > max_size:
+        raise too_large_exc
+
+    size = 0
+    digest = hashlib.sha256()
+
+    with open(path, "wb") as output:
+        def write(data: bytes):
+            digest.update(data)
+            output.write(data)
+
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+
+            if size > max_size:
+                raise too_large_exc
+
+            await run_in_threadpool(write, chunk)
+
+    return size, digest.hexdigest()
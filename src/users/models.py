@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String
+from sqlalchemy import String, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import LargeBinary
@@ -19,3 +19,8 @@ class UserORM(Base):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
 
     password: Mapped[bytes] = mapped_column(LargeBinary(length=60))
+
+
+Index("ix_User_name_lower", func.lower(UserORM.name))
+Index("ix_User_name_trgm", UserORM.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("ix_User_created_at_id", UserORM.created_at, UserORM.id)
@@ -1,13 +1,15 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.teams.schemas import STeam, STeamMember
+from src.teams.schemas import STeam
 from src.teams.models import TeamORM, TeamMemberORM
-from src.database import get_async_session
-from src.auth import auth_manager
+from src.teams.loaders import team_loader_options
+from src.database import get_async_read_session
+from src.pagination import SPage, Pagination, like_prefix
+from src.auth import auth_manager, Principal
 
 from .models import UserORM
 from .schemas import SUser, SPersonalData
@@ -21,13 +23,13 @@ routers = (user_router, users_router, current_user_router)
 
 
 @user_router.get("/", response_model=SUser | None)
-async def get_user(session: Annotated[AsyncSession, Depends(get_async_session)],
-                   current_user: Annotated[UserORM, Depends(auth_manager.current_user_or_none)],
+async def get_user(session: Annotated[AsyncSession, Depends(get_async_read_session)],
+                   current_user: Annotated[Principal | None, Depends(auth_manager.current_principal_or_none)],
                    id: int | None = None, name: str | None = None):
     if id is not None:
         query = select(UserORM).where(UserORM.id == id).limit(1)
     elif name is not None:
-        query = select(UserORM).where(UserORM.name.ilike(name)).limit(1)
+        query = select(UserORM).where(func.lower(UserORM.name) == name.lower()).limit(1)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,9 +49,19 @@ async def get_user(session: Annotated[AsyncSession, Depends(get_async_session)],
     return user
 
 
-@users_router.get("/", response_model=list[SUser])
-async def get_users(session: Annotated[AsyncSession, Depends(get_async_session)]):
-    return (await session.execute(select(UserORM))).scalars().all()
+@users_router.get("/", response_model=SPage[SUser])
+async def get_users(session: Annotated[AsyncSession, Depends(get_async_read_session)],
+                    pagination: Annotated[Pagination, Depends()],
+                    name: str | None = None, sort: Literal["id", "created_at"] = "id"):
+    columns = (UserORM.id, ) if sort == "id" else (UserORM.created_at, UserORM.id)
+    query = select(UserORM)
+
+    if name is not None:
+        query = query.where(UserORM.name.ilike(like_prefix(name)))
+
+    users = (await session.execute(pagination.apply(query, *columns))).scalars().all()
+
+    return pagination.page(users, *columns)
 
 
 @current_user_router.get("/", response_model=SUser)
@@ -61,28 +73,14 @@ async def get_current_user(current_user: Annotated[UserORM, Depends(auth_manager
 
 
 @current_user_router.get("/teams", response_model=list[STeam])
-async def get_current_user_teams(session: Annotated[AsyncSession, Depends(get_async_session)],
-                                 current_user: Annotated[UserORM, Depends(auth_manager.current_user)]):
-    teams = (await session.execute(
+async def get_current_user_teams(session: Annotated[AsyncSession, Depends(get_async_read_session)],
+                                 current_user: Annotated[Principal, Depends(auth_manager.current_principal)]):
+    return (await session.execute(
         select(TeamORM).where(TeamORM.id.in_(
             select(TeamMemberORM.team_id).where(TeamMemberORM.member_id == current_user.id)
-        ))
-    )).scalars().all()
-
-    members = (await session.execute(
-        select(TeamMemberORM, UserORM).join(UserORM, UserORM.id == TeamMemberORM.member_id)
-    )).all()
-
-    return [
-        STeam(
-            **team.__dict__,
-            members=[
-                STeamMember(
-                    user=SUser.from_orm(user),
-                    role=member.role
-                )
-                for member, user in members if member.team_id == team.id
-            ]
+        )).options(
+            *team_loader_options()
+        ).order_by(
+            TeamORM.id
         )
-        for team in teams
-    ]
+    )).scalars().all()
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from src.avatars.identicon import avatar_url
 
 
 class SPersonalData(BaseModel):
@@ -22,3 +24,11 @@ class SUser(BaseModel):
     avatar_url: str | None
     personal_data: SPersonalData = SPersonalData()
     created_at: datetime
+
+    @model_validator(mode="after")
+    def default_avatar(self):
+        # Rows from before identicons, or whose upload was rejected, fall back to the generated avatar
+        if self.avatar_url is None:
+            self.avatar_url = avatar_url("user", self.id)
+
+        return self
@@ -0,0 +1,28 @@
+import pytest
+import pytest_asyncio
+
+from src import config
+
+
+# Tests that need Postgres expect a database migrated with `alembic upgrade head` and skip without one
+DATABASE_CONFIGURED = config.DB_HOST is not None and config.DB_PORT is not None
+
+if not DATABASE_CONFIGURED:
+    # Engines connect lazily, so placeholders are enough to import the modules under test
+    config.DB_HOST, config.DB_PORT, config.DB_READ_PORT = "localhost", "5432", "5432"
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    if not DATABASE_CONFIGURED:
+        pytest.skip("No database configured")
+
+    from src.database import engine, read_engine
+
+    yield engine
+
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from src.avatars.identicon import avatar_url
+from src.teams.schemas import STeam
+from src.users.schemas import SUser
+
+
+def test_missing_avatar_falls_back_to_identicon():
+    assert STeam(id=5, name="Team", avatar_url=None).avatar_url == avatar_url("team", 5)
+    assert SUser(id=7, name="user", avatar_url=None, created_at=datetime.now()).avatar_url == avatar_url("user", 7)
+
+
+def test_stored_avatar_is_kept():
+    assert STeam(id=5, name="Team", avatar_url="https://cdn/poster.png").avatar_url == "https://cdn/poster.png"
@@ -0,0 +1,123 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.brackets.enums import EBracketSide
+from src.brackets.formats import (PlannedMatch, seed_order, single_elimination, double_elimination, round_robin,
+                                  swiss_pairings, swiss_round, swiss_rounds)
+
+
+def feeds(planned: list[PlannedMatch]) -> Counter:
+    # Every slot is filled by a seated team or by a winner or loser link from another match
+    fed = Counter()
+
+    for match in planned:
+        fed[match.key] += sum(team is not None for team in match.teams)
+
+        for link in (match.next, match.loser):
+            if link is not None:
+                fed[link[0]] += 1
+
+    return fed
+
+
+def test_seed_order():
+    assert seed_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+
+    for size in (2, 4, 16, 64):
+        order = seed_order(size)
+
+        assert sorted(order) == list(range(size))
+        # The top two seeds are in opposite halves, so they can only meet in the final
+        assert order.index(0) < size // 2 <= order.index(1)
+
+
+@pytest.mark.parametrize("count", range(2, 41))
+def test_single_elimination(count):
+    teams = list(range(100, 100 + count))
+    planned = single_elimination(teams)
+
+    assert len(planned) == count - 1
+    assert all(fed == 2 for fed in feeds(planned).values())
+    assert sorted(team for match in planned for team in match.teams if team is not None) == teams
+    assert [match.next is None for match in planned].count(True) == 1
+
+
+def test_single_elimination_passes_byes_through():
+    # Five teams in an eight-slot bracket: seeds 1 to 3 skip round 1 and are seated straight into round 2
+    planned = single_elimination([1, 2, 3, 4, 5])
+    first_round = [match for match in planned if match.round == 1]
+
+    assert [match.teams for match in first_round] == [[4, 5]]
+    assert {team for match in planned if match.round == 2 for team in match.teams} == {1, 2, 3, None}
+    assert not any(match.bye for match in planned)
+
+
+@pytest.mark.parametrize("count", range(2, 41))
+def test_double_elimination(count):
+    teams = list(range(100, 100 + count))
+    planned = double_elimination(teams)
+
+    assert len(planned) == 2 * count - 2
+    assert all(fed == 2 for fed in feeds(planned).values())
+    assert sorted(team for match in planned for team in match.teams if team is not None) == teams
+
+    final = [match for match in planned if match.next is None]
+    assert [match.side for match in final] == [EBracketSide.GRAND_FINAL]
+    assert all(match.loser is not None for match in planned if match.side == EBracketSide.UPPER)
+
+
+@pytest.mark.parametrize("count", range(2, 13))
+def test_round_robin(count):
+    teams = list(range(count))
+    planned = round_robin(teams)
+
+    pairs = [frozenset(match.teams) for match in planned]
+    assert len(pairs) == count * (count - 1) // 2
+    assert set(pairs) == {frozenset((first, second)) for first in teams for second in teams if first < second}
+
+    for round in {match.round for match in planned}:
+        playing = [team for match in planned if match.round == round for team in match.teams]
+        assert len(playing) == len(set(playing))
+
+
+def test_swiss_pairings_avoid_rematches():
+    standings = [(1, 2), (2, 2), (3, 1), (4, 1)]
+    pairs, bye = swiss_pairings(standings, {frozenset((1, 2)), frozenset((3, 4))}, set())
+
+    assert bye is None
+    assert {frozenset(pair) for pair in pairs} == {frozenset((1, 3)), frozenset((2, 4))}
+
+
+def test_swiss_pairings_rotate_the_bye():
+    pairs, bye = swiss_pairings([(1, 1), (2, 1), (3, 0)], set(), {3})
+
+    assert bye == 2
+    assert pairs == [(1, 3)]
+
+
+@pytest.mark.parametrize("count", [8, 15, 16, 33])
+def test_swiss_tournament_has_no_rematches_or_repeated_byes(count):
+    rnd = random.Random(count)
+    scores = {team: 0 for team in range(count)}
+    played, byes = set(), set()
+
+    for round in range(1, swiss_rounds(count) + 1):
+        standings = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        planned = swiss_round(round, standings, played, byes)
+
+        seated = [team for match in planned for team in match.teams if team is not None]
+        assert sorted(seated) == list(range(count))
+
+        for match in planned:
+            if match.bye:
+                assert match.teams[0] not in byes
+                byes.add(match.teams[0])
+                scores[match.teams[0]] += 1
+                continue
+
+            pair = frozenset(match.teams)
+            assert pair not in played
+            played.add(pair)
+            scores[rnd.choice(match.teams)] += 1
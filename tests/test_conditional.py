@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from src.conditional import Version
+
+
+def test_list_etag_depends_on_the_window():
+    updated_at = datetime(2026, 1, 1)
+
+    # Same max and count, but a row left the window and another one entered it
+    assert Version(updated_at, 2, (1, 2)).etag != Version(updated_at, 2, (2, 3)).etag
+    assert Version(updated_at, 2, (1, 2)).etag == Version(updated_at, 2, (1, 2)).etag
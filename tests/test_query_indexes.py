@@ -0,0 +1,86 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Select, select, text, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pagination import Pagination, like_prefix
+from src.users.models import UserORM
+from src.teams.models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+from src.teams.enums import ETeamJoinRequestType
+from src.matches.models import MatchORM
+from src.matches.enums import EMatchStatus
+from src.matches.router import filter_matches
+from src.tournaments.models import GameORM, TournamentMemberORM
+from src.tournaments.enums import ETournamentStatus
+from src.tournaments.router import filter_tournaments
+
+
+def keyset_page(query: Select, *columns) -> Select:
+    cursor = Pagination.encode_cursor([datetime(2026, 1, 1), 1])
+
+    return Pagination(cursor=cursor, order="desc").apply(query, *columns)
+
+
+QUERIES = {
+    "ix_User_name_lower": select(UserORM.id).where(func.lower(UserORM.name) == "name"),
+    "ix_User_created_at_id": keyset_page(select(UserORM.id), UserORM.created_at, UserORM.id),
+    "ix_Team_name_lower": select(TeamORM.id).where(func.lower(TeamORM.name) == "name"),
+    "ix_TeamMember_member_id": select(TeamMemberORM.team_id).where(TeamMemberORM.member_id == 1),
+    "ix_TeamJoinRequest_user_id_type": select(TeamJoinRequestORM.team_id).where(
+        TeamJoinRequestORM.user_id == 1, TeamJoinRequestORM.type == ETeamJoinRequestType.INVITE
+    ),
+    "ix_Match_status": filter_matches(select(MatchORM.id), EMatchStatus.in_progress, None, None),
+    "ix_Match_created_at_id": keyset_page(select(MatchORM.id), MatchORM.created_at, MatchORM.id),
+    "ix_MatchMember_team_id": filter_matches(select(MatchORM.id), None, None, 1),
+    "ix_Game_name_lower": select(GameORM.id).where(func.lower(GameORM.name) == "name"),
+    "ix_Game_short_name_lower": select(GameORM.id).where(func.lower(GameORM.short_name) == "name"),
+    "ix_Tournament_game_id": filter_tournaments(select(text("1")), None, 1),
+    "ix_Tournament_status": filter_tournaments(select(text("1")), ETournamentStatus.ACTIVE, None),
+    "ix_TournamentMember_team_id": select(TournamentMemberORM.tournament_id).where(TournamentMemberORM.team_id == 1)
+}
+
+TRIGRAM_QUERIES = {
+    "ix_User_name_trgm": select(UserORM.id).where(UserORM.name.ilike(like_prefix("nam"))),
+    "ix_Team_name_trgm": select(TeamORM.id).where(TeamORM.name.ilike(like_prefix("nam")))
+}
+
+
+def index_names(node: dict) -> set[str]:
+    names = {node["Index Name"]} if "Index Name" in node else set()
+
+    for child in node.get("Plans", ()):
+        names |= index_names(child)
+
+    return names
+
+
+async def planned_indexes(session: AsyncSession, query: Select) -> set[str]:
+    # Test tables are tiny, so whole-table reads are priced out to see which index the planner would pick; a covering
+    # index-only scan of a composite primary key would otherwise beat the index on its second column
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    await session.execute(text("SET LOCAL enable_indexonlyscan = off"))
+
+    statement = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"))).scalar_one()
+
+    return index_names((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index", QUERIES)
+async def test_router_query_uses_index(db_engine, index):
+    async with AsyncSession(db_engine) as session:
+        assert index in await planned_indexes(session, QUERIES[index])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index", TRIGRAM_QUERIES)
+async def test_prefix_search_uses_trigram_index(db_engine, index):
+    async with AsyncSession(db_engine) as session:
+        if await session.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")) == 0:
+            pytest.skip("pg_trgm is not installed")
+
+        assert index in await planned_indexes(session, TRIGRAM_QUERIES[index])
@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.config import RATING_INITIAL
+from src.ratings.rebuild import rating_waves, replay_ratings
+from src.ratings.updates import rating_change
+
+
+def sequential_ratings(matches: list[tuple[int, int, int]]) -> dict[tuple[int, int], tuple[float, int, int]]:
+    stats = {}
+
+    for game, winner, loser in matches:
+        winner_rating, winner_played, winner_wins = stats.get((game, winner), (RATING_INITIAL, 0, 0))
+        loser_rating, loser_played, loser_wins = stats.get((game, loser), (RATING_INITIAL, 0, 0))
+        change = rating_change(winner_rating, loser_rating)
+
+        stats[game, winner] = (winner_rating + change, winner_played + 1, winner_wins + 1)
+        stats[game, loser] = (loser_rating - change, loser_played + 1, loser_wins)
+
+    return stats
+
+
+def random_matches(rnd: random.Random, count: int, teams: int, games: int) -> list[tuple[int, int, int]]:
+    return [(rnd.randrange(games), *rnd.sample(range(teams), 2)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_replay_matches_sequential_elo(seed):
+    rnd = random.Random(seed)
+    matches = random_matches(rnd, rnd.randrange(1, 400), rnd.randrange(2, 30), rnd.randrange(1, 4))
+
+    keys, stats, _ = replay_ratings(np.array(matches, dtype=np.int64))
+    expected = sequential_ratings(matches)
+
+    assert sorted(map(tuple, keys.tolist())) == sorted(expected)
+
+    for key, (rating, played, wins) in zip(map(tuple, keys.tolist()), stats.tolist()):
+        assert rating == pytest.approx(expected[key][0], abs=1e-9)
+        assert (played, wins) == expected[key][1:]
+
+
+def test_replay_of_nothing():
+    keys, stats, waves = replay_ratings(np.empty((0, 3), dtype=np.int64))
+
+    assert len(keys) == len(stats) == waves == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_waves_never_repeat_a_team(seed):
+    rnd = random.Random(seed)
+    size = rnd.randrange(2, 20)
+    pairs = [rnd.sample(range(size), 2) for _ in range(200)]
+    winners, losers = np.array(pairs).T
+
+    waves = rating_waves(winners, losers, size)
+    last = {}
+
+    for wave, winner, loser in zip(waves.tolist(), winners.tolist(), losers.tolist()):
+        # Each team's matches land in strictly increasing waves, which keeps its own order
+        assert wave > max(last.get(winner, -1), last.get(loser, -1))
+        last[winner] = last[loser] = wave
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import database
+from src.conditional import Version, current_version
+from src.response_cache import ResponseCache, MemoryResponseCacheBackend
+
+
+def make_cached_endpoint(cache: ResponseCache):
+    calls = []
+
+    @cache.cached("item", dict, lambda item: [f"item:{item['id']}"])
+    async def get_item(session: AsyncSession, id: int):
+        calls.append(id)
+        return {"id": id}
+
+    return get_item, calls
+
+
+@pytest.mark.asyncio
+async def test_cached_until_invalidated():
+    cache = ResponseCache(MemoryResponseCacheBackend())
+    get_item, calls = make_cached_endpoint(cache)
+    session = AsyncSession(bind=database.engine)
+
+    await get_item(session, 1)
+    await get_item(session, 1)
+    assert calls == [1]
+
+    await cache.invalidate("item:1")
+    await get_item(session, 1)
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_primary_pinned_requests_skip_cache(monkeypatch):
+    monkeypatch.setattr(database, "read_engine", object())
+
+    cache = ResponseCache(MemoryResponseCacheBackend())
+    get_item, calls = make_cached_endpoint(cache)
+    pinned = AsyncSession(bind=database.engine)
+
+    await get_item(pinned, 1)
+    await get_item(pinned, 1)
+
+    assert calls == [1, 1]
+    assert cache.get_metrics()["size"] == 0
+    assert cache.bypassed == 2
+
+
+@pytest.mark.asyncio
+async def test_conditional_version_is_part_of_the_key():
+    cache = ResponseCache(MemoryResponseCacheBackend())
+    get_item, calls = make_cached_endpoint(cache)
+    session = AsyncSession(bind=database.engine)
+
+    token = current_version.set(Version(datetime(2026, 1, 1)))
+    await get_item(session, 1)
+    await get_item(session, 1)
+    current_version.reset(token)
+
+    # A newer version, as another worker would see it before this one's entry is invalidated
+    token = current_version.set(Version(datetime(2026, 1, 2)))
+    await get_item(session, 1)
+    current_version.reset(token)
+
+    assert calls == [1, 1]
@@ -0,0 +1,39 @@
+from src.tournaments.seeding import assign_seeds
+
+
+def seeds_of(ranked):
+    return [(seed.team_id, seed.seed, seed.seed_locked) for seed in assign_seeds(ranked)]
+
+
+def test_unlocked_teams_follow_the_ranking():
+    assert seeds_of([(30, None, False), (10, 5, False), (20, None, False)]) == [
+        (30, 1, False), (10, 2, False), (20, 3, False)
+    ]
+
+
+def test_locked_seed_is_kept_and_others_fill_around_it():
+    assert seeds_of([(1, None, False), (2, None, False), (3, 1, True), (4, None, False)]) == [
+        (3, 1, True), (1, 2, False), (2, 3, False), (4, 4, False)
+    ]
+
+
+def test_out_of_range_lock_is_clamped_and_stays_locked():
+    # The field shrank from 6 to 3 after seed 6 was locked
+    assert seeds_of([(1, None, False), (2, 6, True), (3, None, False)]) == [
+        (1, 1, False), (3, 2, False), (2, 3, True)
+    ]
+
+
+def test_out_of_range_locks_do_not_displace_in_range_ones():
+    assert seeds_of([(1, 3, True), (2, 5, True), (3, 4, True)]) == [
+        (3, 1, True), (2, 2, True), (1, 3, True)
+    ]
+
+
+def test_every_team_gets_a_distinct_seed():
+    ranked = [(team_id, team_id * 7 % 13 or None, team_id % 3 == 0) for team_id in range(1, 40)]
+    seeds = assign_seeds(ranked)
+
+    assert sorted(seed.seed for seed in seeds) == list(range(1, 40))
+    assert {seed.team_id for seed in seeds if seed.seed_locked} == {team_id for team_id, seed, locked in ranked
+                                                                      if locked and seed is not None}
@@ -0,0 +1,141 @@
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import insert, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.teams.models import TeamORM
+from src.tournaments.models import GameORM, TournamentORM, TournamentMemberORM
+from src.matches.models import MatchORM
+from src.matches.enums import EMatchStatus
+from src.brackets.models import BracketMatchORM
+from src.brackets.enums import EBracketFormat
+from src.brackets.engine import create_bracket
+from src.brackets.advancement import lock_bracket_match, advance_bracket
+from src.standings.rebuild import compute_standings, rebuild_standings
+
+
+def test_compute_standings_counts_byes_and_skips_undecided_matches():
+    keys, stats = compute_standings(np.array([
+        (1, 10, 20, 10),
+        (1, 30, 0, 30),
+        (1, 20, 30, 0),
+        (1, 10, 30, 30)
+    ], dtype=np.int64))
+
+    assert dict(zip(map(tuple, keys.tolist()), map(tuple, stats.tolist()))) == {
+        # played, wins, losses, byes, points, buchholz
+        (1, 10): (2, 1, 1, 0, 1, 0 + 2),
+        (1, 20): (1, 0, 1, 0, 0, 1),
+        (1, 30): (1, 1, 0, 1, 2, 1)
+    }
+
+
+async def play_out(session: AsyncSession, bracket_id: int, rnd: random.Random):
+    while True:
+        ready = (await session.execute(
+            select(
+                BracketMatchORM.match_id, BracketMatchORM.first_team_id, BracketMatchORM.second_team_id,
+                BracketMatchORM.next_match_id
+            ).join(
+                MatchORM, MatchORM.id == BracketMatchORM.match_id
+            ).where(
+                BracketMatchORM.bracket_id == bracket_id,
+                MatchORM.status == EMatchStatus.preparing
+            ).order_by(
+                BracketMatchORM.match_id
+            )
+        )).all()
+
+        if not ready:
+            return
+
+        match_id, first_team_id, second_team_id, next_match_id = rnd.choice(ready)
+        winner_id = rnd.choice((first_team_id, second_team_id))
+        roll = rnd.random()
+
+        # Walkovers score like wins; a cancellation without a winner is only allowed where nobody advances
+        if roll < 0.2 and next_match_id is None:
+            status, winner_id = EMatchStatus.cancelled, None
+        elif roll < 0.4:
+            status = EMatchStatus.cancelled
+        else:
+            status = EMatchStatus.finished
+
+        bracket_match = await lock_bracket_match(session, match_id)
+
+        await session.execute(
+            update(
+                MatchORM
+            ).where(
+                MatchORM.id == match_id
+            ).values(
+                status=status,
+                team_winner_id=winner_id,
+                finished_at=func.now()
+            )
+        )
+
+        await advance_bracket(session, bracket_match, winner_id)
+
+
+@pytest.mark.parametrize("format, teams", [
+    (EBracketFormat.SWISS, 9),
+    (EBracketFormat.SWISS, 12),
+    (EBracketFormat.ROUND_ROBIN, 7),
+    (EBracketFormat.SINGLE_ELIMINATION, 11),
+    (EBracketFormat.DOUBLE_ELIMINATION, 6)
+])
+@pytest.mark.asyncio
+async def test_incremental_standings_match_the_rebuild(db_engine, format, teams):
+    rnd = random.Random(teams)
+
+    # Everything happens in one transaction that is rolled back, so the database is left as it was
+    async with AsyncSession(db_engine) as session:
+        game_id = (await session.execute(
+            insert(
+                GameORM
+            ).values(
+                name=f"Standings test {format.name}", short_name=f"st-{format.name}"
+            ).returning(
+                GameORM.id
+            )
+        )).scalar_one()
+
+        tournament_id = (await session.execute(
+            insert(
+                TournamentORM
+            ).values(
+                name="Standings test", game_id=game_id
+            ).returning(
+                TournamentORM.id
+            )
+        )).scalar_one()
+
+        team_ids = (await session.scalars(
+            insert(
+                TeamORM
+            ).returning(
+                TeamORM.id, sort_by_parameter_order=True
+            ),
+            [{"name": f"Standings test {index}"} for index in range(teams)]
+        )).all()
+
+        await session.execute(
+            insert(TournamentMemberORM),
+            [
+                {"tournament_id": tournament_id, "team_id": team_id, "seed": seed}
+                for seed, team_id in enumerate(team_ids, start=1)
+            ]
+        )
+
+        bracket_id = await create_bracket(session, tournament_id, format, list(team_ids))
+        await play_out(session, bracket_id, rnd)
+
+        result = await rebuild_standings(session, tournament_id)
+
+        assert result.teams == teams
+        assert result.mismatches == []
+
+        await session.rollback()
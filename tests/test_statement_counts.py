@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from itertools import product
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, delete, select, literal, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.users.models import UserORM
+from src.teams.models import TeamORM, TeamMemberORM, TeamJoinRequestORM
+from src.teams.enums import ETeamJoinRequestType, ETeamMemberRole
+from src.matches.models import MatchORM, MatchMemberORM
+from src.matches.enums import EMatchType
+from src.tournaments.models import GameORM, TournamentORM, TournamentMemberORM
+
+
+TEAMS = 3
+# (members, join requests) per team; varying them separately exposes a members x requests term in the rows fetched
+SHAPES = list(product((1, 4), (1, 4)))
+
+
+@dataclass
+class Graph:
+    prefix: str
+    user_id: int
+    team_id: int
+    tournament_id: int
+    game_id: int
+    match_id: int
+
+
+@dataclass
+class Cost:
+    statements: int
+    rows: int
+
+
+async def create_graph(session: AsyncSession, members: int, requests: int) -> Graph:
+    # TEAMS teams with the given members and join requests each, all in one tournament and one match; the first
+    # user is a member of every team
+    prefix = f"stmt{uuid4().hex[:8]}_"
+
+    user_ids = (await session.scalars(
+        insert(UserORM).returning(UserORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}", "password": b"-"} for index in range(1 + TEAMS * (members - 1 + requests))]
+    )).all()
+
+    team_ids = (await session.scalars(
+        insert(TeamORM).returning(TeamORM.id, sort_by_parameter_order=True),
+        [{"name": f"{prefix}{index}"} for index in range(TEAMS)]
+    )).all()
+
+    others = iter(user_ids[1:])
+
+    for team_id in team_ids:
+        await session.execute(insert(TeamMemberORM), [
+            {"team_id": team_id, "member_id": member_id}
+            for member_id in [user_ids[0], *(next(others) for _ in range(members - 1))]
+        ])
+        await session.execute(insert(TeamJoinRequestORM), [
+            {"team_id": team_id, "user_id": next(others), "type": ETeamJoinRequestType.REQUEST}
+            for _ in range(requests)
+        ])
+
+    game_id = (await session.execute(
+        insert(GameORM).values(name=prefix, short_name=prefix).returning(GameORM.id)
+    )).scalar_one()
+
+    tournament_id = (await session.execute(
+        insert(TournamentORM).values(name=prefix, game_id=game_id).returning(TournamentORM.id)
+    )).scalar_one()
+
+    await session.execute(insert(TournamentMemberORM), [
+        {"tournament_id": tournament_id, "team_id": team_id} for team_id in team_ids
+    ])
+
+    match_id = (await session.execute(
+        insert(MatchORM).values(type=EMatchType.competitive).returning(MatchORM.id)
+    )).scalar_one()
+
+    await session.execute(insert(MatchMemberORM), [
+        {"match_id": match_id, "team_id": team_id} for team_id in team_ids[:2]
+    ])
+
+    await session.commit()
+
+    return Graph(prefix, user_ids[0], team_ids[0], tournament_id, game_id, match_id)
+
+
+async def delete_prefixed(session: AsyncSession, prefix: str):
+    await session.execute(delete(TeamORM).where(TeamORM.name.startswith(prefix)))
+    await session.execute(delete(UserORM).where(UserORM.name.startswith(prefix)))
+    await session.commit()
+
+
+async def delete_graph(session: AsyncSession, graph: Graph):
+    await session.execute(delete(MatchORM).where(MatchORM.id == graph.match_id))
+    await session.execute(delete(TournamentORM).where(TournamentORM.id == graph.tournament_id))
+    await session.execute(delete(GameORM).where(GameORM.id == graph.game_id))
+    await delete_prefixed(session, graph.prefix)
+
+
+@pytest_asyncio.fixture
+async def graphs(db_engine):
+    async with AsyncSession(db_engine) as session:
+        created = {shape: await create_graph(session, *shape) for shape in SHAPES}
+
+        yield created
+
+        for graph in created.values():
+            await delete_graph(session, graph)
+
+
+@pytest_asyncio.fixture
+async def client(db_engine, monkeypatch):
+    from src.main import app
+    from src.response_cache import response_cache
+
+    # Cached bodies would hide the queries
+    monkeypatch.setattr(response_cache, "backend", None)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def fetched(db_engine):
+    from src.database import read_engine
+
+    # Row counts of the statements run; for a SELECT that is the number of rows sent back by the database
+    rowcounts = []
+
+    def record(_connection, cursor, *_):
+        rowcounts.append(max(cursor.rowcount, 0))
+
+    engines = {db_engine.sync_engine, read_engine.sync_engine}
+
+    for engine in engines:
+        event.listen(engine, "after_cursor_execute", record)
+
+    yield rowcounts
+
+    for engine in engines:
+        event.remove(engine, "after_cursor_execute", record)
+
+
+async def measure(client: AsyncClient, fetched: list[int], url: str, **kwargs) -> Cost:
+    fetched.clear()
+    response = await client.get(url, **kwargs)
+
+    assert response.status_code == 200, response.text
+
+    return Cost(len(fetched), sum(fetched))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url, params", [
+    ("/team/", lambda graph: {"id": graph.team_id}),
+    ("/tournament/", lambda graph: {"id": graph.tournament_id}),
+    ("/tournaments/", lambda graph: {"game_id": graph.game_id}),
+    ("/match/", lambda graph: {"id": graph.match_id}),
+    ("/matches/", lambda graph: {"team_id": graph.team_id})
+])
+async def test_graph_endpoints_fetch_rows_linear_in_the_graph(graphs, client, fetched, url, params):
+    costs = {shape: await measure(client, fetched, url, params=params(graphs[shape])) for shape in SHAPES}
+    rows = {shape: cost.rows for shape, cost in costs.items()}
+
+    assert len({cost.statements for cost in costs.values()}) == 1, costs
+    assert rows[4, 4] > rows[1, 1], rows
+
+    # Zero when members and join requests each add their own rows, positive when they are joined against each other
+    assert rows[4, 4] - rows[4, 1] - rows[1, 4] + rows[1, 1] == 0, rows
+
+
+async def add_outside_memberships(session: AsyncSession, prefix: str, users: int, teams: int):
+    # Every outside user joins every outside team, none of them related to the caller
+    await session.execute(
+        insert(UserORM),
+        [{"name": f"{prefix}user{index}", "password": b"-"} for index in range(users)]
+    )
+    await session.execute(
+        insert(TeamORM),
+        [{"name": f"{prefix}team{index}"} for index in range(teams)]
+    )
+    await session.execute(
+        insert(
+            TeamMemberORM
+        ).from_select(
+            ["team_id", "member_id", "role"],
+            select(
+                TeamORM.id, UserORM.id, literal(ETeamMemberRole.MEMBER)
+            ).join(
+                UserORM, true()
+            ).where(
+                TeamORM.name.startswith(prefix),
+                UserORM.name.startswith(prefix)
+            )
+        )
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_current_user_teams_cost_ignores_other_memberships(db_engine, graphs, client, fetched):
+    from src.auth import auth_manager
+
+    graph = graphs[4, 4]
+    cookie = SimpleCookie((await auth_manager.login(graph.user_id)).headers["set-cookie"])
+    client.cookies = {name: morsel.value for name, morsel in cookie.items()}
+
+    before = await measure(client, fetched, "/me/teams")
+
+    prefix = f"stmt{uuid4().hex[:8]}_"
+
+    async with AsyncSession(db_engine) as session:
+        try:
+            await add_outside_memberships(session, prefix, 50, 40)
+            after = await measure(client, fetched, "/me/teams")
+        finally:
+            await delete_prefixed(session, prefix)
+
+    assert len((await client.get("/me/teams")).json()) == TEAMS
+    assert before == after